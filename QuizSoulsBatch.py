@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Runner em lote: várias sessões independentes do bot (modos do quiz, contas)
+em paralelo, cada uma num processo com seu próprio navegador, Solver e
+restrições. No fim grava um único relatório.
+
+Config (JSON): lista de sessões ou {"defaults": {...}, "sessions": [...]}.
+Campos de cada sessão (todos opcionais, ver SESSION_DEFAULTS):
+    name, url, sel_suggestions, sel_input, sel_submit, headless,
+    mode ("score" | "info"), max_attempts, max_guesses, dataset,
+    profile (diretório de perfil do Chrome da conta; um por sessão simultânea)
+
+Exemplo:
+    {"defaults": {"headless": true},
+     "sessions": [{"name": "classic"},
+                  {"name": "classic-info", "mode": "info"},
+                  {"name": "conta-2", "profile": "perfis/conta-2"}]}
+
+Uso:
+    python QuizSoulsBatch.py sessoes.json [--workers N] [--json relatorio.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional
+
+from QuizSoulsLOL import (GUESS_MODES, TRACER, Solver, SuggestionScraper, close_driver_pools, load_bosses,
+                          trace_span)
+
+MODES = {"score": GUESS_MODES[0], "info": GUESS_MODES[1]}
+
+SESSION_DEFAULTS: Dict[str, Any] = {
+    "name": None,
+    "url": "https://daily-souls.netlify.app/classic/",
+    "sel_suggestions": ".suggestion",
+    "sel_input": "input[type='text']",
+    "sel_submit": "button[type='submit']",
+    "headless": True,
+    "mode": "score",
+    "max_attempts": 7,
+    "max_guesses": 512,
+    "dataset": None,
+    "profile": None,
+}
+
+MEM_PER_SESSION_MB = 400   # estimativa de um Chrome headless + solver
+
+
+def load_sessions(path: str) -> List[Dict[str, Any]]:
+    """Lê a config e devolve as sessões já completadas com os defaults."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        defaults, sessions = {}, data
+    else:
+        defaults, sessions = data.get("defaults", {}), data.get("sessions", [])
+    out = []
+    for i, s in enumerate(sessions):
+        cfg = {**SESSION_DEFAULTS, **defaults, **s}
+        cfg["name"] = cfg["name"] or f"sessao-{i + 1}"
+        if cfg["mode"] not in MODES:
+            raise ValueError(f"{cfg['name']}: modo desconhecido '{cfg['mode']}' (use {sorted(MODES)})")
+        if cfg["profile"] and any(o["profile"] == cfg["profile"] for o in out):
+            raise ValueError(f"{cfg['name']}: perfil '{cfg['profile']}' já usado por outra sessão")
+        out.append(cfg)
+    return out
+
+
+def _available_memory_mb() -> Optional[int]:
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_workers(n_sessions: int) -> int:
+    """Concorrência limitada pelas sessões, pelos CPUs e pela memória livre."""
+    limit = min(n_sessions, os.cpu_count() or 1)
+    mem = _available_memory_mb()
+    if mem is not None:
+        limit = min(limit, max(1, mem // MEM_PER_SESSION_MB))
+    return max(1, limit)
+
+
+def run_session(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Joga uma partida completa no site com um navegador e um Solver próprios."""
+    t0 = time.perf_counter()
+    report: Dict[str, Any] = {"name": cfg["name"], "url": cfg["url"], "mode": cfg["mode"],
+                              "solved": False, "attempts": 0, "guesses": [], "feedback": [],
+                              "error": None}
+    solver = Solver(load_bosses(cfg["dataset"]))
+    scraper = SuggestionScraper(cfg["url"], cfg["sel_suggestions"], cfg["sel_input"],
+                                cfg["sel_submit"], headless=cfg["headless"], profile=cfg["profile"])
+    if not scraper.start():
+        report["error"] = "Selenium/Chrome indisponível: não foi possível iniciar o navegador"
+        report["seconds"] = time.perf_counter() - t0
+        return report
+
+    try:
+        for n in range(1, cfg["max_attempts"] + 1):
+            with trace_span("batch.attempt", session=cfg["name"], attempt=n):
+                suggestions = scraper.get_suggestions() or None
+                choice = solver.choose_guess(MODES[cfg["mode"]], suggestions, max_guesses=cfg["max_guesses"])
+                if choice is None:
+                    report["error"] = "sem candidatos"
+                    break
+                guess = choice[0]
+                if not scraper.send_guess(guess.name):
+                    report["error"] = f"falha ao enviar o palpite {guess.name}"
+                    break
+                report["attempts"] += 1
+                report["guesses"].append(guess.name)
+                feedback = scraper.get_feedback_from_site()
+                if not feedback:
+                    report["error"] = "feedback não capturado"
+                    break
+                report["feedback"].append(feedback)
+                if all(v == "IGUAL" for v in feedback.values()):
+                    report["solved"] = True
+                    break
+                solver.apply(feedback, guess)
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        # fecha o navegador: o pool encerra os processos sem rodar o atexit, e
+        # devolver a sessão ao pool deixaria um Chrome órfão por worker
+        scraper.stop(recycle=False)
+        close_driver_pools()
+        if TRACER.enabled:
+            TRACER.export()
+    report["seconds"] = time.perf_counter() - t0
+    return report
+
+
+def run_batch(sessions: List[Dict[str, Any]], workers: Optional[int] = None) -> Dict[str, Any]:
+    """Roda as sessões num pool de processos; o relatório mantém a ordem da config."""
+    workers = workers or default_workers(len(sessions))
+    t0 = time.perf_counter()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(sessions)
+    if workers <= 1:
+        results = [run_session(cfg) for cfg in sessions]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_session, cfg): i for i, cfg in enumerate(sessions)}
+            for fut in as_completed(futures):
+                i = futures[fut]
+                try:
+                    results[i] = fut.result()
+                except Exception as e:   # processo morreu (ex.: falta de memória)
+                    results[i] = {"name": sessions[i]["name"], "url": sessions[i]["url"],
+                                  "mode": sessions[i]["mode"], "solved": False, "attempts": 0,
+                                  "guesses": [], "feedback": [], "seconds": 0.0,
+                                  "error": f"{type(e).__name__}: {e}"}
+    wall = time.perf_counter() - t0
+
+    solved = [r for r in results if r["solved"]]
+    return {
+        "sessions": len(sessions),
+        "workers": workers,
+        "wall_seconds": wall,
+        "session_seconds": sum(r["seconds"] for r in results),
+        "solved": len(solved),
+        "errors": sum(1 for r in results if r["error"]),
+        "mean_attempts": sum(r["attempts"] for r in solved) / len(solved) if solved else 0.0,
+        "results": results,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Sessões: {report['sessions']} | workers: {report['workers']} "
+        f"| tempo total: {report['wall_seconds']:.1f}s (soma das sessões: {report['session_seconds']:.1f}s)",
+        f"Resolvidas: {report['solved']}/{report['sessions']} | erros: {report['errors']} "
+        f"| média de tentativas: {report['mean_attempts']:.2f}",
+    ]
+    for r in report["results"]:
+        status = "OK " if r["solved"] else "-- "
+        extra = f" | erro: {r['error']}" if r["error"] else ""
+        lines.append(f"  {status}{r['name']}: {r['attempts']} tentativas, {r['seconds']:.1f}s{extra}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Roda várias sessões do bot QuizSouls em paralelo.")
+    parser.add_argument("config", help="JSON com as sessões")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processos simultâneos (padrão: limitado por CPUs e memória livre)")
+    parser.add_argument("--json", help="grava o relatório completo neste arquivo")
+    args = parser.parse_args(argv)
+
+    sessions = load_sessions(args.config)
+    if not sessions:
+        print("Nenhuma sessão na config.")
+        return 1
+    report = run_batch(sessions, args.workers)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0 if report["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
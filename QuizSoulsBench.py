@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks do solver: funções de score (micro) e ranking/feedback sobre
+tabelas sintéticas de bosses, do tamanho do dataset até 1M de linhas (macro).
+
+As tabelas sintéticas copiam as listas de categorias de bosses reais e sorteiam
+HP/optional; ficam em colunas (BossTable), então os motores vetorizados rodam
+em 1M de linhas sem montar 1M de BossRecord. Os benchmarks em Python puro
+(rank_bosses completo, V1) param em --max-python-rows.
+
+Os estados de restrição (inicial / meio / final) saem de uma partida
+self-play no dataset real.
+
+Uso:
+    python QuizSoulsBench.py [--sizes 32,1000,10000,100000,1000000] [--json resultado.json]
+    python QuizSoulsBench.py --baseline base.json [--threshold 0.25]   # sai com 1 se regrediu
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import argparse
+import platform
+from typing import Callable, List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from QuizSoulsLOL import (COUNT_COLUMNS, LIST_FIELDS, BossRecord, BossTable, IncrementalRanker,
+                          ScoringEngine, Solver, apply_feedback_to_restrictions, build_restrictions_state,
+                          load_bosses, rank_bosses, score_boss, score_count_exact, score_hp,
+                          simulate_feedback)
+import QuizSoulsV1 as v1
+
+DEFAULT_SIZES = [32, 1_000, 10_000, 100_000, 1_000_000]
+MAX_PYTHON_ROWS = 100_000   # benchmarks com laço Python por boss
+MICRO_CALLS = 10_000        # chamadas por repetição nos micro-benchmarks
+BUDGET_SECS = 0.3           # tempo mínimo por benchmark (repete até passar disso)
+
+# vocabulário do solver -> ícones do V1
+V1_SYMBOLS = {"IGUAL": "✅", "PERTO": "⚠️", "DIFERENTE": "❌", "MAIOR": "⬆️", "MENOR": "⬇️"}
+
+
+#  Dados sintéticos
+
+def synthetic_table(n: int, base: List[BossRecord], seed: int = 0) -> BossTable:
+    """
+    Tabela de n bosses no formato do dataset compilado: cada linha copia as
+    categorias de um boss real sorteado e recebe HP (±50%) e optional aleatórios.
+    """
+    rng = np.random.default_rng(seed)
+    tpl = rng.integers(0, len(base), n)
+
+    sid: Dict[str, int] = {}
+    def intern_id(text: str) -> int:
+        if text not in sid:
+            sid[text] = len(sid)
+        return sid[text]
+
+    names = [f"{base[t].name} #{i}" for i, t in enumerate(tpl.tolist())]
+    cols: Dict[str, np.ndarray] = {
+        "name_sid": np.array([intern_id(x) for x in names], dtype="<i4"),
+        "hp": (np.array([b.hp for b in base])[tpl] * rng.uniform(0.5, 1.5, n)).astype("<i8"),
+        "optional": rng.integers(0, 2, n).astype("<i1"),
+    }
+    slug_ids = np.array([intern_id(b.slug or "") for b in base], dtype="<i4")
+    cols["slug_sid"] = slug_ids[tpl]
+    for field, count_col in zip(LIST_FIELDS, COUNT_COLUMNS):
+        lists = [np.array([intern_id(x) for x in getattr(b, field)], dtype="<i4") for b in base]
+        lens = np.array([len(x) for x in lists], dtype="<i4")
+        cols[count_col] = lens[tpl]
+        cols[field + "_ptr"] = np.concatenate(([0], np.cumsum(cols[count_col]))).astype("<i4")
+        cols[field + "_ids"] = (np.concatenate([lists[t] for t in tpl.tolist()]).astype("<i4")
+                                if cols[field + "_ptr"][-1] else np.zeros(0, dtype="<i4"))
+    encoded = [text.encode("utf-8") for text in sid]
+    cols["str_off"] = np.concatenate(([0], np.cumsum([len(e) for e in encoded]))).astype("<i8")
+    cols["str_blob"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return BossTable(cols, n)
+
+
+def selfplay_steps(bosses: List[BossRecord]) -> List[List[Tuple[Dict[str, str], BossRecord]]]:
+    """(feedback, palpite) de cada passo de uma partida por alvo, jogadas pelo Solver."""
+    solver = Solver(bosses)
+    games = []
+    for target in bosses:
+        solver.reset()
+        steps = []
+        for _ in range(7):
+            guess = solver.choose_guess()[0]
+            fb = simulate_feedback(guess, target)
+            steps.append((fb, guess))
+            if guess is target:
+                break
+            solver.apply(fb, guess)
+        games.append(steps)
+    return games
+
+
+def restriction_states(games) -> Dict[str, Dict[str, Any]]:
+    """Estados representativos: sem feedback, depois de um palpite e antes do acerto."""
+    longest = max(games, key=len)
+    states = {"inicial": build_restrictions_state()}
+    r = build_restrictions_state()
+    for i, (fb, guess) in enumerate(longest[:-1], start=1):
+        apply_feedback_to_restrictions(r, fb, guess)
+        if i == 1:
+            states["meio"] = copy.deepcopy(r)
+    states["final"] = copy.deepcopy(r)
+    return states
+
+
+def v1_states(games) -> Dict[str, Dict[str, Any]]:
+    """Os mesmos estados no formato de restrições do QuizSoulsV1."""
+    longest = max(games, key=len)
+    empty = {k: {} for k in v1.constraints}
+    states = {"inicial": copy.deepcopy(empty)}
+    v1.constraints.clear()
+    v1.constraints.update(copy.deepcopy(empty))
+    for i, (fb, guess) in enumerate(longest[:-1], start=1):
+        v1.update_constraints_from_feedback(
+            guess, {("Boss Name" if k == "NAME" else k): V1_SYMBOLS[v] for k, v in fb.items()})
+        if i == 1:
+            states["meio"] = copy.deepcopy(v1.constraints)
+    states["final"] = copy.deepcopy(v1.constraints)
+    v1.candidates.reset()
+    return states
+
+
+def set_v1_state(state: Dict[str, Any]):
+    v1.constraints.clear()
+    v1.constraints.update(copy.deepcopy(state))
+
+
+#  Medição
+
+def measure(fn: Callable[[], Any], budget: float = BUDGET_SECS, min_repeats: int = 3,
+            max_repeats: int = 10_000) -> Dict[str, float]:
+    """Roda fn até somar 'budget' segundos (e ao menos min_repeats vezes, se couber)."""
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_repeats:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget and (len(times) >= min_repeats or elapsed >= 10 * budget):
+            break
+    times.sort()
+    return {"repeats": len(times), "min_ms": 1000 * times[0], "median_ms": 1000 * times[len(times) // 2]}
+
+
+def _result(bench: str, rows: int, state: str, stats: Dict[str, float]) -> Dict[str, Any]:
+    return {"bench": bench, "rows": rows, "state": state, **stats,
+            "ns_per_row": 1e6 * stats["min_ms"] / max(rows, 1)}
+
+
+def micro_benchmarks(base: List[BossRecord], games, states, states_v1, budget: float) -> List[Dict[str, Any]]:
+    out = []
+    rng = np.random.default_rng(1)
+    records = [base[i] for i in rng.integers(0, len(base), MICRO_CALLS).tolist()]
+    hps = [b.hp for b in records]
+    counts = [b.res_count for b in records]
+    for name, r in states.items():
+        hp_min, hp_max = r["HP"]["min"], r["HP"]["max"]
+        res = r["Resistance"]
+        out.append(_result("score_hp", MICRO_CALLS, name, measure(
+            lambda: [score_hp(h, hp_min, hp_max) for h in hps], budget)))
+        out.append(_result("score_count_exact", MICRO_CALLS, name, measure(
+            lambda: [score_count_exact(c, res["exact"], res["not"], res["close"]) for c in counts], budget)))
+        out.append(_result("score_boss", MICRO_CALLS, name, measure(
+            lambda: [score_boss(b, r) for b in records], budget)))
+    for name, state in states_v1.items():
+        set_v1_state(state)
+        out.append(_result("v1.composite_score", MICRO_CALLS, name, measure(
+            lambda: [v1.composite_score(b) for b in records], budget)))
+
+    n_steps = sum(len(g) for g in games)
+    def replay():
+        for steps in games:
+            r = build_restrictions_state()
+            for fb, guess in steps:
+                apply_feedback_to_restrictions(r, fb, guess)
+    out.append(_result("apply_feedback_to_restrictions", n_steps, "selfplay", measure(replay, budget)))
+    return out
+
+
+def macro_benchmarks(base: List[BossRecord], sizes: List[int], states, states_v1, budget: float,
+                     max_python_rows: int, seed: int, log=print) -> List[Dict[str, Any]]:
+    out = []
+    for n in sizes:
+        t0 = time.perf_counter()
+        table = base if n == len(base) else synthetic_table(n, base, seed)
+        log(f"  tabela {n} linhas montada em {time.perf_counter() - t0:.2f}s")
+        out.append(_result("ScoringEngine.build", n, "-", measure(lambda: ScoringEngine(table), budget)))
+        engine = ScoringEngine(table)
+        # registros montados antes de medir (BossTable os cria sob demanda)
+        records = list(table) if n <= max_python_rows else None
+        for name, r in states.items():
+            out.append(_result("ScoringEngine.score", n, name, measure(lambda: engine.score(r), budget)))
+
+            def ranker_top():
+                ranker = IncrementalRanker(engine)
+                ranker.update(r)
+                return ranker.top(10)
+            out.append(_result("IncrementalRanker.top10", n, name, measure(ranker_top, budget)))
+            if n <= max_python_rows:
+                out.append(_result("rank_bosses", n, name, measure(
+                    lambda: rank_bosses(table, r, engine=engine), budget)))
+        if records is not None:
+            for name, state in states_v1.items():
+                set_v1_state(state)
+                out.append(_result("v1.rank_bosses", n, name, measure(lambda: v1.rank_bosses(records), budget)))
+        log(f"  {n} linhas: ok")
+    return out
+
+
+#  Comparação com baseline
+
+def _key(r: Dict[str, Any]) -> Tuple[str, int, str]:
+    return (r["bench"], r["rows"], r["state"])
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """Anota cada resultado com a razão contra o baseline (pelo min_ms); marca regressões."""
+    base = {_key(r): r for r in baseline}
+    for r in results:
+        old = base.get(_key(r))
+        if old and old["min_ms"] > 0:
+            r["baseline_min_ms"] = old["min_ms"]
+            r["ratio"] = r["min_ms"] / old["min_ms"]
+            r["regression"] = r["ratio"] > 1 + threshold
+    return [r for r in results if r.get("regression")]
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':34s} {'linhas':>9s} {'estado':>9s} {'min ms':>11s} {'mediana ms':>11s} "
+             f"{'ns/linha':>10s} {'vs base':>8s}"]
+    for r in results:
+        ratio = r.get("ratio")
+        vs = "" if ratio is None else f"{100 * (ratio - 1):+.0f}%" + (" !" if r.get("regression") else "")
+        lines.append(f"{r['bench']:34s} {r['rows']:9d} {r['state']:>9s} {r['min_ms']:11.3f} "
+                     f"{r['median_ms']:11.3f} {r['ns_per_row']:10.1f} {vs:>8s}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do solver QuizSouls.")
+    parser.add_argument("--dataset", help="JSON de bosses (padrão: bosses_indexed.json / bosses.json)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="tamanhos das tabelas sintéticas, separados por vírgula")
+    parser.add_argument("--max-python-rows", type=int, default=MAX_PYTHON_ROWS,
+                        help="maior tabela para os benchmarks com laço Python por boss")
+    parser.add_argument("--budget", type=float, default=BUDGET_SECS, help="segundos mínimos por benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="regressão = mais lento que o baseline por mais que esta fração")
+    args = parser.parse_args(argv)
+
+    base = list(load_bosses(args.dataset))
+    sizes = [len(base) if s == "dataset" else int(s) for s in args.sizes.split(",") if s]
+    log = lambda msg: print(msg, file=sys.stderr)
+
+    games = selfplay_steps(base)
+    states = restriction_states(games)
+    states_v1 = v1_states(games)
+
+    results = []
+    if not args.skip_micro:
+        log("micro-benchmarks...")
+        results += micro_benchmarks(base, games, states, states_v1, args.budget)
+    log("macro-benchmarks...")
+    results += macro_benchmarks(base, sizes, states, states_v1, args.budget, args.max_python_rows,
+                                args.seed, log)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+    print(format_results(results))
+    if regressions:
+        print(f"\n{len(regressions)} regressões acima de {100 * args.threshold:.0f}%:")
+        for r in regressions:
+            print(f"  {r['bench']} ({r['rows']} linhas, {r['state']}): {r['baseline_min_ms']:.3f} -> {r['min_ms']:.3f} ms")
+
+    if args.json:
+        report = {
+            "meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                     "numpy": np.__version__, "platform": platform.platform(),
+                     "cpus": os.cpu_count(), "bosses": len(base), "sizes": sizes,
+                     "budget": args.budget, "seed": args.seed},
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
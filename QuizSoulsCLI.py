@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Solver em linha de comando, sem DearPyGui nem Selenium: lê transcrições de
+partidas (JSONL, um palpite por linha) e, a cada passo, aplica o feedback ao
+Solver e emite o próximo palpite e o top-k como outra linha JSON.
+No fim mostra a vazão (partidas/s) no stderr.
+
+Formato de entrada (uma linha por palpite; feedback no vocabulário do solver:
+IGUAL / PERTO / DIFERENTE / MAIOR / MENOR):
+    {"game": "2025-10-01", "guess": "The Last Giant",
+     "feedback": {"HP": "MAIOR", "Weapons": "DIFERENTE", ...},
+     "suggestions": ["..."]}          # opcional: restringe o próximo palpite
+Linhas seguidas com o mesmo "game" são a mesma partida (sem "game", a linha
+continua a partida atual). Uma linha só com {"game": ...} abre uma partida nova.
+
+Saída (uma linha por passo):
+    {"game": ..., "step": 1, "guess": ..., "solved": false, "conflicts": [],
+     "candidates": 12, "next_guess": ..., "top": [[nome, score], ...]}
+
+Uso:
+    python QuizSoulsCLI.py partidas.jsonl [--top-k 10] [--mode score|info] [--quiet]
+    cat partidas.jsonl | python QuizSoulsCLI.py -
+"""
+
+import sys
+import json
+import time
+import argparse
+from typing import Iterable, Iterator, List, Dict, Any, Optional, TextIO
+
+from QuizSoulsLOL import GUESS_MODES, TOP_K, Solver, load_bosses
+
+MODES = {"score": GUESS_MODES[0], "info": GUESS_MODES[1]}
+
+
+def read_games(lines: Iterable[str]) -> Iterator[List[Dict[str, Any]]]:
+    """Agrupa as linhas da transcrição em partidas (listas de passos)."""
+    game_id, steps = None, []
+    for n, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"linha {n}: JSON inválido ({e})") from None
+        if "game" in rec and (rec["game"] != game_id or "guess" not in rec):
+            if steps:
+                yield steps
+            game_id, steps = rec["game"], []
+        if "guess" in rec:
+            rec.setdefault("game", game_id)
+            steps.append(rec)
+    if steps:
+        yield steps
+
+
+def replay_game(solver: Solver, steps: List[Dict[str, Any]], mode: str = GUESS_MODES[0],
+                k: int = TOP_K, max_guesses: int = 512) -> Iterator[Dict[str, Any]]:
+    """Joga uma partida gravada no solver, emitindo um registro por passo."""
+    solver.reset()
+    for i, step in enumerate(steps, start=1):
+        out: Dict[str, Any] = {"game": step.get("game"), "step": i, "guess": step["guess"]}
+        guess = solver.engine.name_index.boss(step["guess"])
+        if guess is None:
+            out["error"] = f"boss desconhecido: {step['guess']}"
+            yield out
+            return
+        feedback = step.get("feedback") or {}
+        out["solved"] = bool(feedback) and all(v == "IGUAL" for v in feedback.values())
+        out["conflicts"] = solver.apply(feedback, guess)
+        out["candidates"] = solver.candidates.count()
+        if out["solved"]:
+            yield out
+            return
+        suggestions = step.get("suggestions") or None
+        choice = solver.choose_guess(mode, suggestions, max_guesses=max_guesses)
+        out["next_guess"] = choice[0].name if choice else None
+        out["top"] = [[b.name, round(float(s), 4)] for b, s, _ in solver.ranking(suggestions, k)]
+        yield out
+
+
+def run(lines: Iterable[str], out: Optional[TextIO], mode: str = GUESS_MODES[0], k: int = TOP_K,
+        dataset: Optional[str] = None, max_guesses: int = 512) -> Dict[str, Any]:
+    """Processa todas as partidas; 'out' None descarta os passos (só mede a vazão)."""
+    solver = Solver(load_bosses(dataset))
+    games = steps = errors = 0
+    t0 = time.perf_counter()
+    for game in read_games(lines):
+        games += 1
+        for rec in replay_game(solver, game, mode, k, max_guesses):
+            steps += 1
+            errors += "error" in rec
+            if out is not None:
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    wall = time.perf_counter() - t0
+    return {"games": games, "steps": steps, "errors": errors, "seconds": wall,
+            "games_per_second": games / wall if wall > 0 else 0.0}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Reexecuta transcrições de partidas no solver QuizSouls (sem GUI).")
+    parser.add_argument("transcript", help="arquivo JSONL com os palpites ('-' = stdin)")
+    parser.add_argument("--dataset", help="JSON de bosses (padrão: bosses_indexed.json / bosses.json)")
+    parser.add_argument("--mode", choices=sorted(MODES), default="score", help="estratégia do próximo palpite")
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--max-guesses", type=int, default=512,
+                        help="palpites avaliados por passo no modo info")
+    parser.add_argument("--quiet", action="store_true", help="não emite os passos, só o resumo")
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.transcript == "-" else open(args.transcript, "r", encoding="utf-8")
+    try:
+        summary = run(src, None if args.quiet else sys.stdout, MODES[args.mode], args.top_k,
+                      args.dataset, args.max_guesses)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    finally:
+        if src is not sys.stdin:
+            src.close()
+    print(f"Partidas: {summary['games']} | passos: {summary['steps']} | erros: {summary['errors']} "
+          f"| {summary['seconds']:.2f}s ({summary['games_per_second']:.1f} partidas/s)", file=sys.stderr)
+    return 0 if summary["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,91 +1,660 @@
 # -*- coding: utf-8 -*-
 """
 Requisitos:
-    pip install dearpygui webdriver-manager selenium
+    pip install dearpygui numpy webdriver-manager selenium
 Autor: Fish7w7
 """
 
 import os
+import sys
+import re
 import json
 import math
+import hashlib
+import tempfile
 import time
+import queue
+import atexit
+import threading
+import functools
+import traceback
 
 import random
-from typing import List, Dict, Any, Tuple, Optional
-
-#  Tentativa de import Selenium 
-SELENIUM_OK = True
-try:
-    from selenium import webdriver
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.common.keys import Keys
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.chrome.options import Options
-    from webdriver_manager.chrome import ChromeDriverManager
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from selenium.common.exceptions import TimeoutException
-except Exception:
-    SELENIUM_OK = False
-
-#  DearPyGui
-from dearpygui import dearpygui as dpg
+import unicodedata
+import importlib.util
+from collections import Counter, OrderedDict, deque
+from itertools import chain, count
+from typing import List, Dict, Any, Tuple, Optional, Sequence
+
+#  Relógio de startup: marcos medidos a partir do início do import do módulo
+_STARTUP_T0 = time.perf_counter()
+STARTUP_MARKS: Dict[str, float] = {}
+STARTUP_REPORT_ENV = "QUIZSOULS_STARTUP_REPORT"   # arquivo JSONL para acompanhar os tempos
+
+
+def startup_mark(name: str) -> float:
+    """Registra (só na primeira vez) o tempo em ms desde o import até o marco 'name'."""
+    if name not in STARTUP_MARKS:
+        STARTUP_MARKS[name] = 1000 * (time.perf_counter() - _STARTUP_T0)
+    return STARTUP_MARKS[name]
+
+
+#  Tracing: spans aninhados nos passos quentes, exportados como Chrome trace
+#  (abrir em chrome://tracing ou ui.perfetto.dev). Desligado, cada span custa
+#  uma chamada e um "with" num objeto vazio.
+TRACE_ENV = "QUIZSOULS_TRACE"   # arquivo .json de saída; "{pid}" vira o id do processo
+TRACE_MAX_EVENTS = 1_000_000    # os mais antigos são descartados além disso
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "t0")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self.tracer, self.name, self.args = tracer, name, args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        t1 = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["erro"] = exc_type.__name__
+        self.tracer.add(self.name, self.t0, t1 - self.t0, self.args)
+        return False
+
+
+class Tracer:
+    """
+    Coleta eventos de duração ("ph": "X") por thread; o aninhamento sai do
+    próprio intervalo de tempo, como o viewer espera. export() grava o JSON.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_events: int = TRACE_MAX_EVENTS):
+        self.enabled = False
+        self.path: Optional[str] = None
+        self.events: deque = deque(maxlen=max_events)
+        self._threads: Dict[int, str] = {}
+        self._t0 = time.perf_counter_ns()
+        self._atexit = False
+        if path:
+            self.enable(path)
+
+    def enable(self, path: str):
+        """
+        Liga a coleta; o arquivo é gravado na saída do processo. "{pid}" só é
+        resolvido no export, para que processos filhos (fork) gravem o próprio arquivo.
+        """
+        self.path = path
+        self.enabled = True
+        if not self._atexit:
+            atexit.register(self.export)
+            self._atexit = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str, **args):
+        """Context manager que mede o bloco; args aparecem no painel do evento."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def traced(self, name: Optional[str] = None):
+        """Decorador: cada chamada da função vira um span."""
+        def decorate(fn):
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*a, **kw):
+                if not self.enabled:
+                    return fn(*a, **kw)
+                with _Span(self, label, {}):
+                    return fn(*a, **kw)
+            return wrapper
+        return decorate
+
+    def add(self, name: str, t0_ns: int, dur_ns: int, args: Optional[Dict[str, Any]] = None):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        event = {"name": name, "ph": "X", "ts": (t0_ns - self._t0) / 1000, "dur": dur_ns / 1000,
+                 "pid": os.getpid(), "tid": tid}
+        if args:
+            event["args"] = args
+        self.events.append(event)   # append em deque é atômico entre threads
+
+    def export(self, path: Optional[str] = None) -> Optional[str]:
+        """Grava os eventos (mais os nomes das threads) em JSON; devolve o caminho."""
+        path = path or self.path
+        if not path or not self.events:
+            return None
+        pid = os.getpid()
+        path = path.replace("{pid}", str(pid))
+        meta = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "QuizSouls"}}]
+        meta += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}}
+                 for tid, tname in list(self._threads.items())]
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": meta + list(self.events), "displayTimeUnit": "ms"},
+                          f, ensure_ascii=False, default=str)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Não foi possível gravar o trace em {path}: {e}")
+            return None
+        return path
+
+
+TRACER = Tracer(os.environ.get(TRACE_ENV))
+trace_span = TRACER.span
+traced = TRACER.traced
+
+
+import numpy as np
+
+#  Selenium / webdriver_manager: import sob demanda (ver load_selenium).
+#  Só "Usar Selenium" paga o custo; o modo offline nem chega a importá-los.
+SELENIUM_OK: Optional[bool] = None   # None = ainda não tentou importar
+webdriver = By = Keys = Service = Options = ChromeDriverManager = None
+WebDriverWait = EC = TimeoutException = None
+_SELENIUM_LOCK = threading.Lock()
+
+
+def selenium_available() -> bool:
+    """Se o Selenium está instalado, sem importá-lo (para a GUI decidir rápido)."""
+    if SELENIUM_OK is not None:
+        return SELENIUM_OK
+    return all(importlib.util.find_spec(m) is not None for m in ("selenium", "webdriver_manager"))
+
+
+def load_selenium() -> bool:
+    """Importa o Selenium na primeira chamada (de qualquer thread). Retorna SELENIUM_OK."""
+    global SELENIUM_OK, webdriver, By, Keys, Service, Options, ChromeDriverManager
+    global WebDriverWait, EC, TimeoutException
+    with _SELENIUM_LOCK:
+        if SELENIUM_OK is not None:
+            return SELENIUM_OK
+        try:
+            from selenium import webdriver
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.common.keys import Keys
+            from selenium.webdriver.chrome.service import Service
+            from selenium.webdriver.chrome.options import Options
+            from webdriver_manager.chrome import ChromeDriverManager
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.support import expected_conditions as EC
+            from selenium.common.exceptions import TimeoutException
+            SELENIUM_OK = True
+        except Exception:
+            SELENIUM_OK = False
+        return SELENIUM_OK
+
+
+#  DearPyGui: importado ao abrir a janela (ver load_dearpygui), não no import do módulo
+dpg = None
+
+
+def load_dearpygui():
+    global dpg
+    if dpg is None:
+        from dearpygui import dearpygui as dpg
+    return dpg
 
 # Utilidades / Dados
 
 
+LOG_MAX_LINES = 500
+
+
+class LogBuffer:
+    """
+    Log da GUI em buffer circular: cada mensagem custa O(1) e a memória fica
+    limitada a max_lines. O widget é reescrito no máximo uma vez por frame (flush).
+    """
+
+    def __init__(self, max_lines: int = LOG_MAX_LINES):
+        self.lines: deque = deque(maxlen=max_lines)
+        self.dropped = 0
+        self.dirty = False
+
+    def append(self, msg: str):
+        if len(self.lines) == self.lines.maxlen:
+            self.dropped += 1
+        self.lines.append(msg)
+        self.dirty = True
+
+    def clear(self):
+        self.lines.clear()
+        self.dropped = 0
+        self.dirty = True
+
+    def text(self) -> str:
+        body = "\n".join(self.lines)
+        if self.dropped:
+            return f"... ({self.dropped} linhas antigas descartadas)\n{body}"
+        return body
+
+    def flush(self, ui) -> bool:
+        """Escreve as mensagens acumuladas no widget. False se não havia nada novo."""
+        if not self.dirty:
+            return False
+        self.dirty = False
+        dpg.set_value(ui["log"], self.text())
+        # Scroll para o fim
+        dpg.set_y_scroll(ui["log_child"], 1e9)
+        return True
+
+
 def log(ui, msg: str):
-    """Escreve no log da GUI (sem prints)."""
-    prev = dpg.get_value(ui["log"])
-    if prev:
-        dpg.set_value(ui["log"], prev + "\n" + msg)
-    else:
-        dpg.set_value(ui["log"], msg)
-    # Scroll para o fim
-    dpg.set_y_scroll(ui["log_child"], 1e9)
+    """Escreve no log da GUI (sem prints); o texto vai para a tela no próximo frame."""
+    ui["log_buffer"].append(msg)
 
 
-def load_bosses() -> List[Dict[str, Any]]:
+class BossRecord:
     """
-    Carrega bosses de 'bosses_indexed.json' ou de 'bosses.json'.
+    Registro imutável e compacto de um boss.
+    Listas viram tuplas de strings internadas; as contagens e o optional (0/1)
+    são calculados uma única vez no load.
     """
-    filename = None
-    if os.path.exists("bosses_indexed.json"):
-        filename = "bosses_indexed.json"
-    elif os.path.exists("bosses.json"):
-        filename = "bosses.json"
+
+    __slots__ = ("slug", "name", "hp", "optional",
+                 "weapons", "resistance", "weakness", "immunity",
+                 "wep_count", "res_count", "weak_count", "imm_count")
+
+    def __init__(self, slug: str, name: str, hp: int, optional: int,
+                 weapons=(), resistance=(), weakness=(), immunity=()):
+        _set = object.__setattr__
+        _set(self, "slug", slug)
+        _set(self, "name", name)
+        _set(self, "hp", hp)
+        _set(self, "optional", optional)
+        for field, values in (("weapons", weapons), ("resistance", resistance),
+                              ("weakness", weakness), ("immunity", immunity)):
+            _set(self, field, tuple(sys.intern(str(v)) for v in values))
+        _set(self, "wep_count", len(self.weapons))
+        _set(self, "res_count", len(self.resistance))
+        _set(self, "weak_count", len(self.weakness))
+        _set(self, "imm_count", len(self.immunity))
+
+    @classmethod
+    def from_dict(cls, b: Dict[str, Any]) -> "BossRecord":
+        """Normaliza um boss cru do JSON (mesmos defaults de sempre)."""
+        return cls(
+            slug=b.get("slug", ""),
+            name=b.get("name", b.get("boss", b.get("slug", "Unknown"))),
+            hp=b.get("hp", 0),
+            optional=optional_to_int(b.get("optional", "required")),
+            weapons=b.get("weapons", []),
+            resistance=b.get("resistance", []),
+            weakness=b.get("weakness", []),
+            immunity=b.get("immunity", []),
+        )
+
+    @property
+    def optional_label(self) -> str:
+        return "optional" if self.optional == 1 else "required"
+
+    def __setattr__(self, key, value):
+        raise AttributeError("BossRecord é imutável")
+
+    def __delattr__(self, key):
+        raise AttributeError("BossRecord é imutável")
+
+    def __reduce__(self):
+        # necessário para pickle (ProcessPool etc.), já que __setattr__ é bloqueado
+        return (self.__class__, (self.slug, self.name, self.hp, self.optional,
+                                 self.weapons, self.resistance, self.weakness, self.immunity))
+
+    def __repr__(self) -> str:
+        return f"BossRecord({self.name!r}, hp={self.hp}, opt={self.optional_label})"
+
+
+def load_bosses(filename: Optional[str] = None, use_cache: bool = True) -> List[BossRecord]:
+    """
+    Carrega bosses de 'bosses_indexed.json' ou de 'bosses.json'
+    (ou do arquivo indicado em 'filename').
+    Com use_cache, lê o dataset compilado (.qsd, ver load_dataset_cache), que é
+    reconstruído automaticamente quando o JSON muda.
+    """
+    if not filename:
+        if os.path.exists("bosses_indexed.json"):
+            filename = "bosses_indexed.json"
+        elif os.path.exists("bosses.json"):
+            filename = "bosses.json"
 
     if not filename:
         # retorna dataset mínimo para não travar
-        return [
+        raw = [
             {"name": "Exemplo Boss 1", "hp": 1000, "weapons": ["Sword"], "resistance": ["Fire"], "weakness": ["Ice"], "immunity": [], "optional": "required", "slug": "exemplo1"},
             {"name": "Exemplo Boss 2", "hp": 1500, "weapons": [], "resistance": [], "weakness": ["Lightning"], "immunity": ["Poison"], "optional": "optional", "slug": "exemplo2"},
             {"name": "Exemplo Boss 3", "hp": 800, "weapons": ["Magic"], "resistance": ["Ice", "Fire"], "weakness": [], "immunity": ["Death"], "optional": "required", "slug": "exemplo3"}
         ]
+        return [BossRecord.from_dict(b) for b in raw]
+
+    if use_cache:
+        table = load_dataset_cache(filename)
+        if table is not None:
+            return table
+    return _load_json_bosses(filename)
+
 
+def _load_json_bosses(filename: str) -> List[BossRecord]:
     with open(filename, "r", encoding="utf-8") as f:
         data = json.load(f)
     if isinstance(data, dict):
-        bosses = list(data.values())
+        raw = list(data.values())
     elif isinstance(data, list):
-        bosses = data
+        raw = data
     else:
-        bosses = []
+        raw = []
 
     # normalização
-    for b in bosses:
-        b.setdefault("slug", "")
-        b.setdefault("name", b.get("boss", b.get("slug", "Unknown")))
-        b.setdefault("hp", 0)
-        b.setdefault("optional", "required")
-        b.setdefault("resistance", [])
-        b.setdefault("weakness", [])
-        b.setdefault("immunity", [])
-        b.setdefault("weapons", [])
-    return bosses
+    return [BossRecord.from_dict(b) for b in raw]
+
+
+#  Dataset compilado (.qsd): colunas binárias mapeadas em memória
+#
+#  Layout: MAGIC | versão (u32) | tamanho do cabeçalho (u32) | cabeçalho JSON |
+#  arrays alinhados em 64 bytes. O cabeçalho guarda o sha256 (e tamanho/mtime)
+#  do JSON de origem e do legend.json vizinho (cujo conteúdo também vai no
+#  cabeçalho) e, para cada array, offset/dtype/shape. Textos (nomes,
+#  slugs, categorias) ficam numa tabela de strings única; as categorias de cada
+#  boss são ids nessa tabela (CSR: <campo>_ptr / <campo>_ids).
+
+DATASET_CACHE_MAGIC = b"QSDS"
+DATASET_CACHE_VERSION = 2
+_CACHE_ALIGN = 64
+LIST_FIELDS = ("weapons", "resistance", "weakness", "immunity")
+COUNT_COLUMNS = ("wep_count", "res_count", "weak_count", "imm_count")
+
+
+def dataset_cache_path(source: str) -> str:
+    return os.path.splitext(source)[0] + ".qsd"
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def legend_path(source: str) -> Optional[str]:
+    """legend.json ao lado do JSON de bosses (None se não existir)."""
+    path = os.path.join(os.path.dirname(os.path.abspath(source)), "legend.json")
+    return path if os.path.exists(path) else None
+
+
+def _legend_entry(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Carimbo (tamanho/mtime/sha256) e conteúdo do legend.json para o cabeçalho."""
+    if path is None:
+        return None
+    st = os.stat(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except ValueError:
+        data = None   # legend inválido não impede o cache dos bosses
+    return {"file": os.path.basename(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+            "sha256": _file_sha256(path), "data": data}
+
+
+def build_dataset_cache(source: str, target: Optional[str] = None) -> str:
+    """Compila o JSON de bosses no arquivo binário .qsd e retorna o caminho gravado."""
+    target = target or dataset_cache_path(source)
+    st = os.stat(source)
+    bosses = _load_json_bosses(source)
+    if any(type(b.hp) is not int for b in bosses):
+        raise ValueError("HP não inteiro no dataset; cache binário não suportado")
+
+    sid: Dict[str, int] = {}
+    def intern_id(text: str) -> int:
+        if text not in sid:
+            sid[text] = len(sid)
+        return sid[text]
+
+    n = len(bosses)
+    arrays: Dict[str, np.ndarray] = {
+        "hp": np.array([b.hp for b in bosses], dtype="<i8"),
+        "optional": np.array([b.optional for b in bosses], dtype="<i1"),
+        "name_sid": np.array([intern_id(b.name) for b in bosses], dtype="<i4"),
+        "slug_sid": np.array([intern_id(b.slug or "") for b in bosses], dtype="<i4"),
+    }
+    for field, count_col in zip(LIST_FIELDS, COUNT_COLUMNS):
+        values = [getattr(b, field) for b in bosses]
+        arrays[count_col] = np.array([len(v) for v in values], dtype="<i4")
+        arrays[field + "_ptr"] = np.concatenate(([0], np.cumsum(arrays[count_col]))).astype("<i4")
+        arrays[field + "_ids"] = np.array([intern_id(x) for v in values for x in v], dtype="<i4")
+    encoded = [text.encode("utf-8") for text in sid]          # dict preserva a ordem dos ids
+    arrays["str_off"] = np.concatenate(([0], np.cumsum([len(e) for e in encoded]))).astype("<i8")
+    arrays["str_blob"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    def aligned(pos: int) -> int:
+        return (pos + _CACHE_ALIGN - 1) // _CACHE_ALIGN * _CACHE_ALIGN
+
+    # offsets relativos ao início da área de dados
+    layout, pos = {}, 0
+    for name, arr in arrays.items():
+        pos = aligned(pos)
+        layout[name] = {"offset": pos, "dtype": arr.dtype.str, "shape": list(arr.shape)}
+        pos += arr.nbytes
+    header = json.dumps({
+        "source": os.path.basename(source),
+        "source_sha256": _file_sha256(source),
+        "source_size": st.st_size,
+        "source_mtime_ns": st.st_mtime_ns,
+        "legend": _legend_entry(legend_path(source)),
+        "n": n,
+        "arrays": layout,
+    }).encode("utf-8")
+    data_start = aligned(12 + len(header))
+
+    # temporário único por processo: vários workers podem recompilar ao mesmo
+    # tempo, e cada um só publica (os.replace atômico) um arquivo completo
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(target) + ".", suffix=".tmp",
+                               dir=os.path.dirname(os.path.abspath(target)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(DATASET_CACHE_MAGIC)
+            f.write(np.array([DATASET_CACHE_VERSION, len(header)], dtype="<u4").tobytes())
+            f.write(header)
+            for name, arr in arrays.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(arr.tobytes())
+            f.truncate(data_start + aligned(pos))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return target
+
+
+def _read_cache_header(path: str) -> Optional[Tuple[Dict[str, Any], int]]:
+    """(cabeçalho, início dos dados) ou None se o arquivo não é um .qsd desta versão."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+            if len(head) < 12 or head[:4] != DATASET_CACHE_MAGIC:
+                return None
+            version, size = np.frombuffer(head[4:], dtype="<u4").tolist()
+            if version != DATASET_CACHE_VERSION:
+                return None
+            header = json.loads(f.read(size).decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+    return header, (12 + size + _CACHE_ALIGN - 1) // _CACHE_ALIGN * _CACHE_ALIGN
+
+
+def _stamp_matches(size: Any, mtime_ns: Any, sha256: Any, path: str) -> bool:
+    st = os.stat(path)
+    if size != st.st_size:
+        return False
+    if mtime_ns == st.st_mtime_ns:
+        return True
+    return sha256 == _file_sha256(path)   # tocado, mas talvez igual
+
+
+def _cache_is_fresh(header: Dict[str, Any], source: str) -> bool:
+    if not _stamp_matches(header.get("source_size"), header.get("source_mtime_ns"),
+                          header.get("source_sha256"), source):
+        return False
+    legend, stored = legend_path(source), header.get("legend")
+    if legend is None or stored is None:
+        return legend is None and stored is None
+    return _stamp_matches(stored.get("size"), stored.get("mtime_ns"), stored.get("sha256"), legend)
+
+
+def load_dataset_cache(source: str, rebuild: bool = True) -> Optional["BossTable"]:
+    """
+    Abre o .qsd do 'source' (mapeado em memória). Se faltar ou estiver velho
+    (hash do JSON mudou), recompila antes quando rebuild=True.
+    Retorna None se não der para usar o cache (cai no JSON).
+    """
+    path = dataset_cache_path(source)
+    try:
+        found = _read_cache_header(path)
+        if found is not None and _cache_is_fresh(found[0], source):
+            try:
+                return _open_boss_table(path, *found)
+            except (ValueError, TypeError, KeyError):
+                pass   # truncado/corrompido: tratado como velho
+        if not rebuild:
+            return None
+        build_dataset_cache(source, path)
+        found = _read_cache_header(path)
+        return None if found is None else _open_boss_table(path, *found)
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def _open_boss_table(path: str, header: Dict[str, Any], data_start: int) -> "BossTable":
+    """
+    Mapeia as colunas do .qsd. ValueError se o arquivo não cobre todos os
+    arrays descritos no cabeçalho (ex.: gravação cortada).
+    """
+    size = os.path.getsize(path)
+    specs = header["arrays"]
+    for name, spec in specs.items():
+        nbytes = int(np.prod(spec["shape"], dtype=np.int64)) * np.dtype(spec["dtype"]).itemsize
+        if data_start + spec["offset"] + nbytes > size:
+            raise ValueError(f"cache truncado: {path} ({name})")
+    mm = np.memmap(path, dtype=np.uint8, mode="r")
+    columns = {name: np.ndarray(tuple(spec["shape"]), dtype=np.dtype(spec["dtype"]), buffer=mm,
+                                offset=data_start + spec["offset"])
+               for name, spec in specs.items()}
+    return BossTable(columns, header["n"], path, header.get("source_sha256"),
+                     (header.get("legend") or {}).get("data"))
+
+
+class BossTable(Sequence):
+    """
+    Sequência somente-leitura de BossRecord apoiada nas colunas do .qsd.
+    Os registros são montados sob demanda (e guardados), então abrir o dataset
+    não percorre os bosses; motores que só precisam das colunas (HP, contagens,
+    optional) usam 'columns' direto (ver boss_columns).
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], n: int, path: Optional[str] = None,
+                 version: Optional[str] = None, legend: Optional[Dict[str, Any]] = None):
+        self.columns = columns
+        self.n = n
+        self.path = path
+        self.version = version   # sha256 do JSON de origem
+        self.legend = legend     # conteúdo do legend.json (None se não havia)
+        self.positions: Dict[BossRecord, int] = {}   # registros já montados -> linha
+        self._records: List[Optional[BossRecord]] = [None] * n
+        self._strings: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.n))]
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError("BossTable index out of range")
+        rec = self._records[i]
+        if rec is None:
+            rec = self._records[i] = self._record(i)
+            self.positions[rec] = i
+        return rec
+
+    def __reduce__(self):
+        # processos filhos reabrem o mesmo arquivo em vez de copiar os registros
+        return (_reopen_boss_table, (self.path,))
+
+    def string(self, sid: int) -> str:
+        text = self._strings.get(sid)
+        if text is None:
+            off = self.columns["str_off"]
+            text = self._strings[sid] = sys.intern(
+                self.columns["str_blob"][off[sid]:off[sid + 1]].tobytes().decode("utf-8"))
+        return text
+
+    def _record(self, i: int) -> BossRecord:
+        c = self.columns
+        lists = {}
+        for field in LIST_FIELDS:
+            ptr = c[field + "_ptr"]
+            lists[field] = [self.string(x) for x in c[field + "_ids"][ptr[i]:ptr[i + 1]].tolist()]
+        return BossRecord(slug=self.string(int(c["slug_sid"][i])), name=self.string(int(c["name_sid"][i])),
+                          hp=int(c["hp"][i]), optional=int(c["optional"][i]), **lists)
+
+
+def _reopen_boss_table(path: str) -> "BossTable":
+    found = _read_cache_header(path)
+    if found is None:
+        raise ValueError(f"cache ilegível: {path}")
+    return _open_boss_table(path, *found)
+
+
+def boss_columns(bosses: List[BossRecord]) -> Dict[str, np.ndarray]:
+    """Colunas hp/optional/contagens: direto do .qsd ou montadas a partir dos registros."""
+    if isinstance(bosses, BossTable):
+        return bosses.columns
+    cols = {"hp": np.array([b.hp for b in bosses]),
+            "optional": np.array([b.optional for b in bosses], dtype=np.int64)}
+    for attr in COUNT_COLUMNS:
+        cols[attr] = np.array([getattr(b, attr) for b in bosses], dtype=np.int64)
+    return cols
+
+
+def boss_positions(bosses: List[BossRecord]) -> Dict[BossRecord, int]:
+    """Registro -> linha. No BossTable o dict cresce conforme os registros são montados."""
+    if isinstance(bosses, BossTable):
+        return bosses.positions
+    return {b: i for i, b in enumerate(bosses)}
 
 # Restrições e Ranking
 
+# Pesos do score total (HP, Weapons, Resistance, Weakness, Immunity, Optional)
+SCORE_WEIGHTS = (0.28, 0.16, 0.14, 0.18, 0.16, 0.08)
+SCORE_SCALE = 15.0
+# Pesos dos componentes de contagem (exact, not, close)
+COUNT_WEIGHTS = (0.45, 0.25, 0.30)
+
+
 def optional_to_int(opt_str: str) -> int:
     # no dataset: "required" ou "optional"
     return 1 if str(opt_str).lower() == "optional" else 0
@@ -130,7 +699,7 @@ def score_count_exact(count_value: int, exact: Optional[int], not_list: List[int
         s_close = 0.5
 
     # pesos razoáveis
-    w_exact, w_not, w_close = 0.45, 0.25, 0.30
+    w_exact, w_not, w_close = COUNT_WEIGHTS
     return float(w_exact * s_exact + w_not * s_not + w_close * s_close)
 
 
@@ -147,7 +716,7 @@ def build_restrictions_state() -> Dict[str, Any]:
 
 def apply_feedback_to_restrictions(restr: Dict[str, Any],
                                    feedback: Dict[str, str],
-                                   guess_boss: Dict[str, Any]):
+                                   guess_boss: BossRecord):
     """
     Atualiza restrições com base no feedback textual por atributo.
     feedback: { "HP": "MAIOR/MENOR/IGUAL", "Weapons": "IGUAL/DIFERENTE", ... }
@@ -157,22 +726,22 @@ def apply_feedback_to_restrictions(restr: Dict[str, Any],
     hp_symbol = feedback.get("HP")
     if hp_symbol == "MAIOR":
         # alvo tem HP > guess
-        g = guess_boss["hp"]
+        g = guess_boss.hp
         old = restr["HP"].get("min")
         restr["HP"]["min"] = max(old, g + 1) if old is not None else g + 1
     elif hp_symbol == "MENOR":
-        g = guess_boss["hp"]
+        g = guess_boss.hp
         old = restr["HP"].get("max")
         restr["HP"]["max"] = min(old, g - 1) if old is not None else g - 1
     elif hp_symbol == "IGUAL":
         # igual → faixa fica travada naquele HP
-        g = guess_boss["hp"]
+        g = guess_boss.hp
         restr["HP"]["min"] = g
         restr["HP"]["max"] = g
 
     # Weapons (usa EXATAMENTE a contagem)
     wep_symbol = feedback.get("Weapons")
-    g_wep = len(guess_boss.get("weapons", []))
+    g_wep = guess_boss.wep_count
     if wep_symbol == "IGUAL":
         restr["Weapons"]["exact"] = g_wep
     elif wep_symbol == "DIFERENTE":
@@ -182,9 +751,10 @@ def apply_feedback_to_restrictions(restr: Dict[str, Any],
             restr["Weapons"]["exact"] = 0  
 
     # Resistance / Weakness / Immunity recebem 'close' (tamanho da lista) e 'not' (proibições)
-    for key in ["Resistance", "Weakness", "Immunity"]:
+    for key, g_count in [("Resistance", guess_boss.res_count),
+                         ("Weakness", guess_boss.weak_count),
+                         ("Immunity", guess_boss.imm_count)]:
         sym = feedback.get(key)
-        g_count = len(guess_boss.get(key.lower(), []))
         if sym == "IGUAL":
             restr[key]["exact"] = g_count
         elif sym == "PERTO":
@@ -196,38 +766,60 @@ def apply_feedback_to_restrictions(restr: Dict[str, Any],
 
     # Optional (obrigatoriedade)
     opt_symbol = feedback.get("Optional")
-    g_opt = 1 if str(guess_boss.get("optional", "")).lower() == "optional" else 0
+    g_opt = guess_boss.optional
     if opt_symbol == "IGUAL":
         restr["Optional"]["exact"] = g_opt
     elif opt_symbol == "DIFERENTE":
         restr["Optional"]["exact"] = 1 - g_opt
 
 
-def score_boss(boss: Dict[str, Any], r: Dict[str, Any]) -> Tuple[float, Dict[str, float]]:
+# Modelo de feedback: contagens (IGUAL / PERTO = diferença de 1 / DIFERENTE)
+CLOSE_COUNT_DELTA = 1
+
+
+def simulate_feedback(guess_boss: BossRecord, target: BossRecord) -> Dict[str, str]:
+    """
+    Feedback que o site daria para 'guess_boss' se o alvo fosse 'target',
+    no mesmo vocabulário de apply_feedback_to_restrictions.
+    """
+    fb = {"NAME": "IGUAL" if target.name == guess_boss.name else "DIFERENTE"}
+    if target.hp == guess_boss.hp:
+        fb["HP"] = "IGUAL"
+    else:
+        fb["HP"] = "MAIOR" if target.hp > guess_boss.hp else "MENOR"
+    fb["Weapons"] = "IGUAL" if target.wep_count == guess_boss.wep_count else "DIFERENTE"
+    for key, attr in [("Resistance", "res_count"), ("Weakness", "weak_count"), ("Immunity", "imm_count")]:
+        diff = abs(getattr(target, attr) - getattr(guess_boss, attr))
+        fb[key] = "IGUAL" if diff == 0 else ("PERTO" if diff <= CLOSE_COUNT_DELTA else "DIFERENTE")
+    fb["Optional"] = "IGUAL" if target.optional == guess_boss.optional else "DIFERENTE"
+    return fb
+
+
+def score_boss(boss: BossRecord, r: Dict[str, Any]) -> Tuple[float, Dict[str, float]]:
     """
     Calcula score total e quebra por componente para um boss.
     Retorna (score_total, breakdown).
     """
     # HP
-    s_hp = score_hp(boss["hp"], r["HP"]["min"], r["HP"]["max"])
+    s_hp = score_hp(boss.hp, r["HP"]["min"], r["HP"]["max"])
     # Weapons
-    s_wep = score_count_exact(len(boss["weapons"]), r["Weapons"]["exact"], [], None)
+    s_wep = score_count_exact(boss.wep_count, r["Weapons"]["exact"], [], None)
 
     # Resistance / Weakness / Immunity
-    s_res = score_count_exact(len(boss["resistance"]), r["Resistance"]["exact"], r["Resistance"]["not"], r["Resistance"]["close"])
-    s_weak = score_count_exact(len(boss["weakness"]), r["Weakness"]["exact"], r["Weakness"]["not"], r["Weakness"]["close"])
-    s_imm = score_count_exact(len(boss["immunity"]), r["Immunity"]["exact"], r["Immunity"]["not"], r["Immunity"]["close"])
+    s_res = score_count_exact(boss.res_count, r["Resistance"]["exact"], r["Resistance"]["not"], r["Resistance"]["close"])
+    s_weak = score_count_exact(boss.weak_count, r["Weakness"]["exact"], r["Weakness"]["not"], r["Weakness"]["close"])
+    s_imm = score_count_exact(boss.imm_count, r["Immunity"]["exact"], r["Immunity"]["not"], r["Immunity"]["close"])
 
     # Optional
     opt_exact = r["Optional"]["exact"]
-    opt_val = optional_to_int(boss.get("optional", "required"))
+    opt_val = boss.optional
     s_opt = 1.0 if (opt_exact is None) else (1.0 if opt_exact == opt_val else 0.0)
 
     # Pesos
-    w_hp, w_wep, w_res, w_weak, w_imm, w_opt = 0.28, 0.16, 0.14, 0.18, 0.16, 0.08
+    w_hp, w_wep, w_res, w_weak, w_imm, w_opt = SCORE_WEIGHTS
     total = (w_hp * s_hp + w_wep * s_wep + w_res * s_res +
              w_weak * s_weak + w_imm * s_imm + w_opt * s_opt)
-    scaled = total * 15.0
+    scaled = total * SCORE_SCALE
     breakdown = {
         "HP": s_hp,
         "Weapons": s_wep,
@@ -239,71 +831,1324 @@ def score_boss(boss: Dict[str, Any], r: Dict[str, Any]) -> Tuple[float, Dict[str
     return (scaled, breakdown)
 
 
-def rank_bosses(bosses: List[Dict[str, Any]],
+# Motor de score vetorizado (NumPy)
+
+SCORE_FIELDS = ("HP", "Weapons", "Resistance", "Weakness", "Immunity", "Optional")
+
+
+def freeze_rule(rule: Dict[str, Any]) -> tuple:
+    """Versão hashable de uma regra de restrição (listas viram tuplas)."""
+    return tuple((k, tuple(v) if isinstance(v, list) else v) for k, v in sorted(rule.items()))
+
+
+class RestrictionState:
+    """
+    Estado de restrições imutável e hashable (mesmo formato de
+    build_restrictions_state para leitura: state["HP"]["min"] etc.).
+    apply() devolve um estado novo; os campos que o feedback não mudou são os
+    mesmos objetos do estado anterior (compartilhamento estrutural).
+    """
+
+    __slots__ = ("rules", "key")
+
+    def __init__(self, rules: Optional[Dict[str, Dict[str, Any]]] = None):
+        rules = rules if rules is not None else build_restrictions_state()
+        _set = object.__setattr__
+        _set(self, "rules", rules)
+        _set(self, "key", tuple(freeze_rule(rules[f]) for f in SCORE_FIELDS))
+
+    def __getitem__(self, field: str) -> Dict[str, Any]:
+        return self.rules[field]
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def items(self):
+        return self.rules.items()
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RestrictionState) and self.key == other.key
+
+    def __setattr__(self, key, value):
+        raise AttributeError("RestrictionState é imutável")
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Cópia mutável (para apply_feedback_to_restrictions)."""
+        return {f: {k: list(v) if isinstance(v, list) else v for k, v in rule.items()}
+                for f, rule in self.rules.items()}
+
+    def apply(self, feedback: Dict[str, str], guess_boss: BossRecord) -> "RestrictionState":
+        draft = self.to_dict()
+        apply_feedback_to_restrictions(draft, feedback, guess_boss)
+        old = dict(zip(SCORE_FIELDS, self.key))
+        shared = {f: (self.rules[f] if freeze_rule(rule) == old.get(f) else rule) for f, rule in draft.items()}
+        return RestrictionState(shared)
+
+
+_DATASET_VERSIONS = count(1)
+
+
+class ScoringEngine:
+    """
+    Tabela colunar dos bosses (HP, contagens e optional em arrays NumPy).
+    Pontua todos os bosses numa única passada a partir do mesmo dict de
+    restrições e devolve exatamente os mesmos trios de rank_bosses.
+
+    As funções de score só rodam sobre os valores distintos de cada coluna
+    (poucas contagens, poucos HPs); o resto é gather + soma ponderada + argsort.
+    """
+
+    SCORE_TABLE_CACHE = 256   # tabelas (campo, regra) guardadas antes de limpar
+
+    def __init__(self, bosses: List[BossRecord]):
+        self.bosses = bosses if isinstance(bosses, BossTable) else list(bosses)
+        # versão do dataset (chave de caches): hash da fonte do .qsd ou um contador por motor
+        self.version = getattr(self.bosses, "version", None) or f"mem-{next(_DATASET_VERSIONS)}"
+        self.index_of = boss_positions(self.bosses)
+        self._name_index: Optional[NameIndex] = None
+        cols = boss_columns(self.bosses)
+        self.hp, self.hp_values, self.hp_inv = self._column(cols["hp"])
+        self.wep, self.wep_values, self.wep_inv = self._column(cols["wep_count"])
+        self.res, self.res_values, self.res_inv = self._column(cols["res_count"])
+        self.weak, self.weak_values, self.weak_inv = self._column(cols["weak_count"])
+        self.imm, self.imm_values, self.imm_inv = self._column(cols["imm_count"])
+        self.opt = cols["optional"].astype(np.int64)
+        _, opt_values, opt_inv = self._column(self.opt)
+        # campo -> (valores distintos, índice de cada linha neles) para as tabelas de score
+        self._values = {"HP": self.hp_values, "Weapons": self.wep_values, "Resistance": self.res_values,
+                        "Weakness": self.weak_values, "Immunity": self.imm_values, "Optional": opt_values}
+        self._inv = {"HP": self.hp_inv, "Weapons": self.wep_inv, "Resistance": self.res_inv,
+                     "Weakness": self.weak_inv, "Immunity": self.imm_inv, "Optional": opt_inv}
+        self._tables: Dict[Tuple[str, tuple], np.ndarray] = {}
+
+    @property
+    def name_index(self) -> "NameIndex":
+        # montado no primeiro uso (a whitelist só existe com o navegador aberto)
+        if self._name_index is None:
+            self._name_index = NameIndex(self.bosses)
+        return self._name_index
+
+    @staticmethod
+    def _column(values: List[int]) -> Tuple[np.ndarray, List[int], np.ndarray]:
+        """Retorna (coluna, valores distintos, índice de cada linha nos distintos)."""
+        col = np.asarray(values)
+        uniq, inv = np.unique(col, return_inverse=True)
+        return col, uniq.tolist(), inv.reshape(-1)
+
+    def __len__(self) -> int:
+        return len(self.bosses)
+
+    def score(self, r: Dict[str, Any], rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Tuple[np.ndarray, ...]]:
+        """
+        Calcula o score de todos os bosses (ou só das linhas em 'rows').
+        Retorna (scores_escalados, componentes) com componentes na ordem de SCORE_FIELDS.
+        """
+        parts = tuple(self.component(field, r[field], rows) for field in SCORE_FIELDS)
+        return self.combine(parts), parts
+
+    def component(self, field: str, rule: Dict[str, Any], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score de um único campo de restrição (ex.: "HP") para todos os bosses ou só 'rows'."""
+        inv = self._inv[field]
+        return self.score_table(field, rule)[inv if rows is None else inv[rows]]
+
+    def score_table(self, field: str, rule: Dict[str, Any]) -> np.ndarray:
+        """
+        Tabela de consulta do campo sob 'rule': score de cada valor distinto da
+        coluna (HPs em ordem crescente, contagens, optional 0/1). Compilada uma vez
+        por estado de restrição e guardada; o ranking vira gather + soma.
+        """
+        key = (field, freeze_rule(rule))
+        table = self._tables.get(key)
+        if table is None:
+            if len(self._tables) >= self.SCORE_TABLE_CACHE:
+                self._tables.clear()
+            table = self._tables[key] = self._build_table(field, rule)
+        return table
+
+    def _build_table(self, field: str, rule: Dict[str, Any]) -> np.ndarray:
+        values = self._values[field]
+        if field == "HP":
+            hp_min, hp_max = rule["min"], rule["max"]
+            return np.array([score_hp(v, hp_min, hp_max) for v in values], dtype=np.float64)
+        if field == "Optional":
+            opt_exact = rule["exact"]
+            if opt_exact is None:
+                return np.ones(len(values))
+            return np.array([v == opt_exact for v in values], dtype=np.float64)
+        if field == "Weapons":
+            return self._count_table(values, rule["exact"], [], None)
+        return self._count_table(values, rule["exact"], rule["not"], rule["close"])
+
+    @staticmethod
+    def combine(parts: Tuple[np.ndarray, ...]) -> np.ndarray:
+        """Soma ponderada dos componentes (mesma ordem de operações de score_boss)."""
+        s_hp, s_wep, s_res, s_weak, s_imm, s_opt = parts
+        w_hp, w_wep, w_res, w_weak, w_imm, w_opt = SCORE_WEIGHTS
+        total = (w_hp * s_hp + w_wep * s_wep + w_res * s_res +
+                 w_weak * s_weak + w_imm * s_imm + w_opt * s_opt)
+        return total * SCORE_SCALE
+
+    @staticmethod
+    def _count_table(values: List[int], exact: Optional[int],
+                     not_list: List[int], close_target: Optional[int]) -> np.ndarray:
+        return np.array([score_count_exact(v, exact, not_list, close_target) for v in values], dtype=np.float64)
+
+    def whitelist_indices(self, suggestions_whitelist: Optional[List[str]]) -> np.ndarray:
+        """Índices (crescentes) dos bosses permitidos pela whitelist de nomes (via NameIndex)."""
+        if not suggestions_whitelist:
+            return np.arange(len(self.bosses))
+        return self.name_index.resolve(suggestions_whitelist)[0]
+
+    # 3 (HP) * 3 (Weapons) * 3^3 (Res/Weak/Imm) * 2 (Optional)
+    FEEDBACK_KEYS = 3 * 3 * 27 * 2
+
+    def feedback_keys(self, guess_rows: np.ndarray, target_rows: np.ndarray) -> np.ndarray:
+        """
+        Matriz (G, T) com um código inteiro por feedback que cada palpite geraria
+        para cada alvo (mesmo modelo de simulate_feedback, sem a célula NAME).
+        """
+        g = guess_rows[:, None]
+        t = target_rows[None, :]
+        d_hp = self.hp[t] - self.hp[g]
+        key = np.where(d_hp == 0, 0, np.where(d_hp > 0, 1, 2))
+        key = key * 3 + np.where(self.wep[t] == self.wep[g], 0, 2)
+        for col in (self.res, self.weak, self.imm):
+            d = np.abs(col[t] - col[g])
+            key = key * 3 + np.where(d == 0, 0, np.where(d <= CLOSE_COUNT_DELTA, 1, 2))
+        return key * 2 + (self.opt[t] != self.opt[g])
+
+    def expected_information(self, guess_rows: np.ndarray, target_rows: np.ndarray,
+                             chunk_cells: int = 1 << 21) -> np.ndarray:
+        """
+        Informação esperada (bits) de cada palpite: entropia da partição dos
+        alvos pelo feedback simulado. Processa os palpites em blocos para limitar memória.
+        """
+        n_t = len(target_rows)
+        out = np.zeros(len(guess_rows))
+        if n_t == 0:
+            return out
+        step = max(1, chunk_cells // n_t)
+        nk = self.FEEDBACK_KEYS
+        for start in range(0, len(guess_rows), step):
+            rows = guess_rows[start:start + step]
+            keys = self.feedback_keys(rows, target_rows)
+            keys += (np.arange(len(rows)) * nk)[:, None]
+            counts = np.bincount(keys.ravel(), minlength=len(rows) * nk).reshape(len(rows), nk)
+            c = counts[counts > 0]
+            clogc = np.zeros(counts.shape)
+            clogc[counts > 0] = c * np.log2(c)
+            out[start:start + step] = np.log2(n_t) - clogc.sum(axis=1) / n_t
+        return out
+
+    def triples(self, order: np.ndarray, scores: np.ndarray,
+                parts: Tuple[np.ndarray, ...]) -> List[Tuple[BossRecord, float, Dict[str, float]]]:
+        """
+        Monta os trios (boss, score, breakdown).
+        'order' são índices de boss; 'scores'/'parts' já vêm alinhados com 'order'.
+        """
+        cols = [p.tolist() for p in parts]
+        return [(self.bosses[i], sc, dict(zip(SCORE_FIELDS, bd)))
+                for i, sc, bd in zip(order.tolist(), scores.tolist(), zip(*cols))]
+
+    def rank(self, restrictions: Dict[str, Any],
+             suggestions_whitelist: Optional[List[str]] = None,
+             alive: Optional[int] = None) -> List[Tuple[BossRecord, float, Dict[str, float]]]:
+        """
+        Ranking decrescente (estável) de (boss, score, breakdown).
+        alive: bitset de CandidateIndex; só essas linhas são pontuadas.
+        """
+        idx = self.whitelist_indices(suggestions_whitelist)
+        if alive is not None:
+            idx = np.intersect1d(idx, bits_to_indices(alive, len(self.bosses)), assume_unique=True)
+        scores, parts = self.score(restrictions, idx)
+        # argsort estável do negativo == sort(reverse=True) estável do Python
+        local = np.argsort(-scores, kind="stable")
+        return self.triples(idx[local], scores[local], tuple(p[local] for p in parts))
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Índices dos k maiores scores, em ordem decrescente e com empates resolvidos
+    pelo índice (igual a um sort estável completo), em O(N + k log k).
+    """
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.arange(0)
+    if k < n:
+        thr = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > thr)
+        ties = np.flatnonzero(scores == thr)[:k - len(above)]
+        cand = np.concatenate((above, ties))
+    else:
+        cand = np.arange(n)
+    return cand[np.argsort(-scores[cand], kind="stable")]
+
+
+INFO_MAX_TARGETS = 4096   # alvos usados para estimar a informação esperada de cada palpite
+
+
+class IncrementalRanker:
+    """
+    Ranking incremental sobre um ScoringEngine.
+    Guarda os componentes de score já calculados e, a cada update, só recalcula
+    os campos de restrição que mudaram, e só nas linhas ainda vivas (bitset de
+    CandidateIndex). O top-k vem de top_k_indices em vez de ordenar a tabela inteira.
+    """
+
+    def __init__(self, engine: ScoringEngine):
+        self.engine = engine
+        n = len(engine)
+        self._all = (1 << n) - 1
+        self._rules: Dict[str, Dict[str, Any]] = {}   # campo -> cópia da regra usada
+        self._parts: Dict[str, np.ndarray] = {f: np.zeros(n) for f in SCORE_FIELDS}
+        self.scores = np.zeros(n)
+        self.alive = 0                # linhas com componentes em dia
+        self.rows = np.arange(0)
+
+    def update(self, restrictions: Dict[str, Any], alive: Optional[int] = None) -> List[str]:
+        """
+        Atualiza os componentes que mudaram e retorna a lista desses campos.
+        alive: bitset dos candidatos possíveis (None = todos).
+        """
+        alive = self._all if alive is None else alive
+        fresh = alive & ~self.alive   # linhas que voltaram/entraram (reset, undo)
+        if alive != self.alive:
+            self.rows = bits_to_indices(alive, len(self.engine))
+            self.alive = alive
+
+        changed = [f for f in SCORE_FIELDS if self._rules.get(f) != restrictions[f]]
+        todo = list(SCORE_FIELDS) if fresh else changed
+        if not todo:
+            return changed
+        rows = self.rows
+        for field in todo:
+            rule = restrictions[field]
+            self._parts[field][rows] = self.engine.component(field, rule, rows)
+            self._rules[field] = {k: (list(v) if isinstance(v, list) else v) for k, v in rule.items()}
+        self.scores[rows] = self.engine.combine(tuple(p[rows] for p in self.parts))
+        return changed
+
+    @property
+    def parts(self) -> Tuple[np.ndarray, ...]:
+        return tuple(self._parts[f] for f in SCORE_FIELDS)
+
+    def top(self, k: int, allowed: Optional[np.ndarray] = None) -> List[Tuple[BossRecord, float, Dict[str, float]]]:
+        """
+        Top-k (boss, score, breakdown) dos candidatos vivos do último update.
+        allowed: ids (crescentes) permitidos, ex.: sugestões resolvidas por NameIndex.
+        """
+        idx = self.rows
+        if allowed is not None:
+            idx = np.intersect1d(idx, allowed, assume_unique=True)
+        order = idx[top_k_indices(self.scores[idx], k)]
+        return self.engine.triples(order, self.scores[order], tuple(p[order] for p in self.parts))
+
+    def informative_guess(self, allowed: Optional[np.ndarray] = None,
+                          max_guesses: int = 512,
+                          max_targets: int = INFO_MAX_TARGETS) -> Optional[Tuple[Tuple[BossRecord, float, Dict[str, float]], float]]:
+        """
+        Palpite de máxima informação esperada entre os candidatos vivos (e os ids
+        em 'allowed'). Considera os 'max_guesses' de maior score como palpites e
+        os vivos como alvos; empate fica com o de maior score.
+        Com mais de 'max_targets' vivos, a entropia é estimada numa amostra fixa
+        (semente = nº de vivos), o que limita o custo a max_guesses x max_targets.
+        Retorna ((boss, score, breakdown), bits) ou None se não houver candidatos.
+        """
+        pool = self.top(max_guesses, allowed)
+        if not pool:
+            return None
+        guess_rows = np.array([self.engine.index_of[b] for b, _, _ in pool])
+        targets = self.rows
+        if max_targets and len(targets) > max_targets:
+            rng = np.random.default_rng(len(targets))
+            targets = np.sort(rng.choice(targets, max_targets, replace=False))
+        gains = self.engine.expected_information(guess_rows, targets)
+        best = int(np.argmax(gains))
+        return pool[best], float(gains[best])
+
+
+# Índice de candidatos (bitsets)
+
+def bits_from_mask(mask: np.ndarray) -> int:
+    """Converte um array booleano num bitset (int do Python, bit i = linha i)."""
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+def bits_to_indices(bits: int, n: int) -> np.ndarray:
+    """Índices (crescentes) dos bits ligados num bitset de n linhas."""
+    raw = np.frombuffer(bits.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little")[:n])
+
+
+def popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+class CandidateIndex:
+    """
+    Índice de bitsets sobre a tabela de bosses: um bitset por valor de Optional,
+    por valor de cada contagem e por faixa (bucket) de HP.
+    Feedback "duro" (HP maior/menor/igual, contagem IGUAL, Optional, palpite
+    errado) vira AND/ANDNOT desses bitsets; 'alive' guarda quem ainda é possível.
+    """
+
+    HP_BUCKETS = 64
+    COUNT_ATTRS = {"Weapons": "wep_count", "Resistance": "res_count",
+                   "Weakness": "weak_count", "Immunity": "imm_count"}
+
+    def __init__(self, bosses: List[BossRecord]):
+        self.bosses = bosses if isinstance(bosses, BossTable) else list(bosses)
+        self.n = len(self.bosses)
+        self.all_bits = (1 << self.n) - 1
+        self.position = boss_positions(self.bosses)
+        cols = boss_columns(self.bosses)
+
+        opt = cols["optional"]
+        self.optional = {v: bits_from_mask(opt == v) for v in (0, 1)}
+
+        self.counts: Dict[str, Dict[int, int]] = {}
+        for field, attr in self.COUNT_ATTRS.items():
+            col = cols[attr]
+            self.counts[field] = {int(v): bits_from_mask(col == v) for v in np.unique(col)}
+
+        # buckets de HP: limites nos quantis dos valores distintos
+        self.hp = np.asarray(cols["hp"])
+        uniq = np.unique(self.hp)
+        cut = np.linspace(0, len(uniq), min(self.HP_BUCKETS, len(uniq)), endpoint=False).astype(int)
+        self.hp_edges = uniq[cut]
+        bucket = np.searchsorted(self.hp_edges, self.hp, side="right") - 1
+        self.hp_members = [np.flatnonzero(bucket == b) for b in range(len(self.hp_edges))]
+        self.hp_bucket_bits = [bits_from_mask(bucket == b) for b in range(len(self.hp_edges))]
+        self.hp_bucket_max = [self.hp[m].max() for m in self.hp_members]
+
+        self.reset()
+
+    def reset(self):
+        self.field_bits = {f: self.all_bits for f in SCORE_FIELDS}
+        self.excluded = 0
+        self.alive = self.all_bits
+
+    def snapshot(self) -> Tuple[Dict[str, int], int, int]:
+        """Estado atual (os bitsets são ints imutáveis; só o dict é copiado)."""
+        return dict(self.field_bits), self.excluded, self.alive
+
+    def restore(self, snap: Tuple[Dict[str, int], int, int]):
+        field_bits, self.excluded, self.alive = snap
+        self.field_bits = dict(field_bits)
+
+    #  bitsets por atributo
+    def hp_range_bits(self, lo: Optional[int], hi: Optional[int]) -> int:
+        """Bosses com lo <= HP <= hi (None = sem limite)."""
+        bits = 0
+        for b, edge in enumerate(self.hp_edges):
+            top = self.hp_bucket_max[b]
+            if (lo is not None and top < lo) or (hi is not None and edge > hi):
+                continue
+            if (lo is None or edge >= lo) and (hi is None or top <= hi):
+                bits |= self.hp_bucket_bits[b]
+            else:
+                # bucket de fronteira: refina pelos HPs dos membros
+                m = self.hp_members[b]
+                ok = np.ones(len(m), dtype=bool)
+                if lo is not None:
+                    ok &= self.hp[m] >= lo
+                if hi is not None:
+                    ok &= self.hp[m] <= hi
+                mask = np.zeros(self.n, dtype=bool)
+                mask[m[ok]] = True
+                bits |= bits_from_mask(mask)
+        return bits
+
+    def count_bits(self, field: str, lo: Optional[int], hi: Optional[int] = None) -> int:
+        """Bosses cuja contagem em 'field' está em [lo, hi] (hi omitido = exato)."""
+        hi = lo if hi is None else hi
+        bits = 0
+        for v, vb in self.counts[field].items():
+            if (lo is None or v >= lo) and (hi is None or v <= hi):
+                bits |= vb
+        return bits
+
+    #  eliminação
+    def restrict(self, field: str, bits: int) -> bool:
+        """
+        Mantém só os candidatos em 'bits' para o campo. Se isso zerar os
+        candidatos (feedback contraditório), nada muda e retorna False.
+        """
+        alive = self.alive & bits
+        if not alive:
+            return False
+        self.field_bits[field] &= bits
+        self.alive = alive
+        return True
+
+    def exclude(self, boss: BossRecord) -> bool:
+        """Remove um boss específico (palpite que não era o alvo)."""
+        i = self.position.get(boss)
+        if i is None:
+            return False
+        bit = 1 << i
+        if self.alive == bit:
+            return False
+        self.excluded |= bit
+        self.alive &= ~bit
+        return True
+
+    def apply_feedback(self, feedback: Dict[str, str], guess_boss: BossRecord) -> List[str]:
+        """
+        Aplica o feedback (mesmos símbolos de apply_feedback_to_restrictions).
+        Retorna os campos cujo feedback contradiz os anteriores (ignorados).
+        """
+        conflicts = []
+        g = guess_boss.hp
+        hp_symbol = feedback.get("HP")
+        hp_bits = {"MAIOR": lambda: self.hp_range_bits(g + 1, None),
+                   "MENOR": lambda: self.hp_range_bits(None, g - 1),
+                   "IGUAL": lambda: self.hp_range_bits(g, g),
+                   "DIFERENTE": lambda: self.all_bits & ~self.hp_range_bits(g, g)}.get(hp_symbol)
+        if hp_bits and not self.restrict("HP", hp_bits()):
+            conflicts.append("HP")
+
+        for field, attr in self.COUNT_ATTRS.items():
+            if feedback.get(field) == "IGUAL":
+                if not self.restrict(field, self.count_bits(field, getattr(guess_boss, attr))):
+                    conflicts.append(field)
+
+        opt_symbol = feedback.get("Optional")
+        if opt_symbol in ("IGUAL", "DIFERENTE"):
+            want = guess_boss.optional if opt_symbol == "IGUAL" else 1 - guess_boss.optional
+            if not self.restrict("Optional", self.optional[want]):
+                conflicts.append("Optional")
+
+        # qualquer atributo diferente prova que o palpite não é o alvo
+        if any(v in ("MAIOR", "MENOR", "PERTO", "DIFERENTE") for v in feedback.values()):
+            self.exclude(guess_boss)
+        return conflicts
+
+    #  consultas
+    def is_alive(self, boss: BossRecord) -> bool:
+        i = self.position.get(boss)
+        return i is not None and bool(self.alive >> i & 1)
+
+    def count(self, field: Optional[str] = None) -> int:
+        """Candidatos vivos (ou que satisfazem só o campo 'field')."""
+        return popcount(self.alive if field is None else self.field_bits[field])
+
+
+@traced("rank_bosses")
+def rank_bosses(bosses: List[BossRecord],
                 restrictions: Dict[str, Any],
-                suggestions_whitelist: Optional[List[str]] = None) -> List[Tuple[Dict[str, Any], float, Dict[str, float]]]:
+                suggestions_whitelist: Optional[List[str]] = None,
+                engine: Optional[ScoringEngine] = None,
+                alive: Optional[int] = None) -> List[Tuple[BossRecord, float, Dict[str, float]]]:
     """
     Gera ranking (lista ordenada decrescente) de (boss, score, breakdown).
     Se suggestions_whitelist for fornecida: filtra candidatos por nome contido nessa lista.
+    engine: ScoringEngine já construído para 'bosses' (evita remontar as colunas a cada chamada).
+    alive: bitset de CandidateIndex com os candidatos ainda possíveis.
     """
-    items = []
-    for b in bosses:
-        if suggestions_whitelist:
-            if b["name"] not in suggestions_whitelist:
-                continue
-        sc, bd = score_boss(b, restrictions)
-        items.append((b, sc, bd))
-    items.sort(key=lambda x: x[1], reverse=True)
-    return items
+    if engine is None:
+        engine = ScoringEngine(bosses)
+    return engine.rank(restrictions, suggestions_whitelist, alive)
+
+
+# Solver (sem GUI)
+
+TOP_K = 10  # linhas da tabela de ranking
+FILTERED_ROWS = 20  # linhas visíveis na tabela de busca
+GUESS_MODES = ["Maior score", "Máxima informação"]
+
+
+class RankingCache:
+    """LRU de rankings prontos, com contadores de acerto/erro."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.last_hit = False
+
+    def get(self, key: tuple):
+        value = self.entries.get(key)
+        self.last_hit = value is not None
+        if self.last_hit:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        else:
+            self.misses += 1
+        return value
+
+    def put(self, key: tuple, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0.0
+        return f"{self.hits} hits / {self.misses} misses ({rate:.0f}%)"
+
+
+RANKING_CACHE_SIZE = 128
+
+
+class SolverSnapshot:
+    """Um ponto do histórico de feedback: restrições, candidatos e o ranking já calculado."""
+
+    __slots__ = ("restrictions", "candidates", "last_guess_boss", "ranking")
+
+    def __init__(self, restrictions: RestrictionState, candidates, last_guess_boss, ranking):
+        self.restrictions = restrictions
+        self.candidates = candidates
+        self.last_guess_boss = last_guess_boss
+        self.ranking = ranking   # (chave do cache, top-k, sugestões) ou None
+
+
+class Solver:
+    """
+    Estado de uma partida sem GUI: restrições, índice de candidatos e ranking
+    incremental. Usado pela App e por execuções sem janela (simulador etc.).
+    """
+
+    def __init__(self, bosses: List[BossRecord], engine: Optional[ScoringEngine] = None):
+        self.bosses = bosses
+        self.engine = engine or ScoringEngine(bosses)
+        self.ranker = IncrementalRanker(self.engine)
+        self.candidates = CandidateIndex(bosses)
+        self.cache = RankingCache(RANKING_CACHE_SIZE)
+        self.reset()
+
+    def reset(self):
+        self.restrictions = RestrictionState()
+        self.candidates.reset()
+        self.last_guess_boss: Optional[BossRecord] = None
+        self.unresolved: List[str] = []   # sugestões que não casaram com nenhum boss
+        self.last_suggestions: Optional[List[str]] = None
+        self._last_ranking: Optional[tuple] = None
+        # histórico persistente: pilhas como listas encadeadas (snapshot, resto);
+        # os estados compartilham os campos de restrição que não mudaram
+        self._undo: Optional[tuple] = None
+        self._redo: Optional[tuple] = None
+
+    def resolve_suggestions(self, suggestions: Optional[List[str]]) -> Optional[np.ndarray]:
+        """Ids dos bosses sugeridos pelo site (None = sem filtro); atualiza self.unresolved."""
+        if not suggestions:
+            self.unresolved = []
+            return None
+        ids, self.unresolved = self.engine.name_index.resolve(suggestions)
+        return ids
+
+    @traced("Solver.ranking")
+    def ranking(self, suggestions: Optional[List[str]] = None,
+                k: int = TOP_K) -> List[Tuple[BossRecord, float, Dict[str, float]]]:
+        """
+        Top-k atual (só candidatos vivos, filtrado pelas sugestões).
+        Memoizado por (estado, candidatos vivos, sugestões, k, versão do dataset):
+        reset e feedback que não muda nada devolvem o ranking já calculado.
+        """
+        allowed = self.resolve_suggestions(suggestions)
+        key = (self.restrictions, self.candidates.alive,
+               None if allowed is None else allowed.tobytes(), k, self.engine.version)
+        ranking = self.cache.get(key)
+        if ranking is None:
+            with trace_span("Solver.ranking.compute", k=k):
+                self.ranker.update(self.restrictions, self.candidates.alive)
+                ranking = self.ranker.top(k, allowed)
+            self.cache.put(key, ranking)
+        self.last_suggestions = suggestions
+        self._last_ranking = (key, ranking, suggestions)
+        return ranking
+
+    @traced("Solver.choose_guess")
+    def choose_guess(self, mode: str = GUESS_MODES[0],
+                     suggestions: Optional[List[str]] = None,
+                     max_guesses: int = 512) -> Optional[Tuple[BossRecord, float, Optional[float]]]:
+        """
+        Escolhe o próximo palpite: o top 1 ou, no modo de informação (com mais de
+        2 candidatos), o de maior informação esperada entre os 'max_guesses' melhores.
+        Retorna (boss, score, bits_esperados ou None) ou None se não houver candidatos.
+        """
+        allowed = self.resolve_suggestions(suggestions)
+        self.ranker.update(self.restrictions, self.candidates.alive)
+        top = self.ranker.top(1, allowed)
+        if not top:
+            return None
+        boss, score, _ = top[0]
+        gain = None
+        if mode == GUESS_MODES[1] and self.candidates.count() > 2:
+            choice = self.ranker.informative_guess(allowed, max_guesses)
+            if choice:
+                (boss, score, _), gain = choice
+        self.last_guess_boss = boss
+        return boss, score, gain
+
+    @traced("Solver.apply")
+    def apply(self, feedback: Dict[str, str], guess_boss: Optional[BossRecord] = None) -> List[str]:
+        """
+        Aplica o feedback do palpite (por padrão o último escolhido) às restrições
+        e ao índice de candidatos. Retorna os campos contraditórios ignorados.
+        """
+        guess_boss = guess_boss or self.last_guess_boss
+        self._undo = (self._snapshot(), self._undo)
+        self._redo = None
+        self.restrictions = self.restrictions.apply(feedback, guess_boss)
+        return self.candidates.apply_feedback(feedback, guess_boss)
+
+    #  Desfazer / refazer feedback
+    @property
+    def can_undo(self) -> bool:
+        return self._undo is not None
+
+    @property
+    def can_redo(self) -> bool:
+        return self._redo is not None
+
+    def undo(self) -> bool:
+        """Volta ao estado anterior ao último feedback. False se não há o que desfazer."""
+        if self._undo is None:
+            return False
+        snap, self._undo = self._undo
+        self._redo = (self._snapshot(), self._redo)
+        self._restore(snap)
+        return True
+
+    def redo(self) -> bool:
+        """Reaplica o último feedback desfeito. False se não há o que refazer."""
+        if self._redo is None:
+            return False
+        snap, self._redo = self._redo
+        self._undo = (self._snapshot(), self._undo)
+        self._restore(snap)
+        return True
+
+    def _snapshot(self) -> SolverSnapshot:
+        return SolverSnapshot(self.restrictions, self.candidates.snapshot(), self.last_guess_boss,
+                              self._last_ranking)
+
+    def _restore(self, snap: SolverSnapshot):
+        self.restrictions = snap.restrictions
+        self.candidates.restore(snap.candidates)
+        self.last_guess_boss = snap.last_guess_boss
+        self._last_ranking = snap.ranking
+        self.last_suggestions = snap.ranking[2] if snap.ranking else None
+        if snap.ranking:
+            # o ranking do estado volta para o cache: o próximo ranking() é só uma consulta
+            self.cache.put(snap.ranking[0], snap.ranking[1])
+
 
+# Nomes e busca de bosses
+
+def normalize_text(text: str) -> str:
+    """Minúsculas, sem acentos/apóstrofos/pontuação e com espaços simples."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = re.sub(r"['\u2019`´]", "", text)          # "Gwyn's" == "gwyns"
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text).split())
+
+
+class NameIndex:
+    """
+    Nome (e slug) normalizado -> id do boss. Resolve a lista de sugestões do
+    site num conjunto de ids em O(M), tolerando diferenças de caixa, acentos,
+    apóstrofos e espaços.
+    """
+
+    def __init__(self, bosses: List[BossRecord]):
+        self.bosses = bosses
+        self.exact: Dict[str, int] = {}       # atalho: nome exatamente como no dataset
+        self.ids: Dict[str, int] = {}
+        for i, b in enumerate(bosses):
+            self.exact.setdefault(b.name, i)
+            for key in (normalize_text(b.name), normalize_text(b.slug or "")):
+                if key:
+                    self.ids.setdefault(key, i)
+
+    def lookup(self, name: str) -> Optional[int]:
+        i = self.exact.get(name)
+        return i if i is not None else self.ids.get(normalize_text(name))
+
+    def boss(self, name: str) -> Optional[BossRecord]:
+        i = self.lookup(name)
+        return None if i is None else self.bosses[i]
+
+    def resolve(self, names: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """Ids (crescentes, sem repetição) dos nomes e a lista dos que não casaram."""
+        found, unresolved = set(), []
+        for name in names:
+            i = self.lookup(name)
+            if i is None:
+                unresolved.append(name)
+            else:
+                found.add(i)
+        return np.array(sorted(found), dtype=np.int64), unresolved
+
+
+class BossSearchIndex:
+    """
+    Índice de n-gramas (1 a 3 caracteres) sobre nome e slug normalizados.
+
+    Consultas de até 3 caracteres saem direto das listas (também separadas por
+    início do nome / início de palavra, para o ranking). As mais longas
+    intersectam as listas dos trigramas e confirmam por substring; quando a
+    consulta só estende a anterior, refinam o resultado anterior. Com
+    fuzzy=True, completa com nomes parecidos (trigramas em comum) para tolerar
+    erros de digitação.
+    """
+
+    FUZZY_MIN_COVERAGE = 0.4   # fração dos trigramas da consulta presentes no nome
+    SMALL_POOL = 256           # abaixo disso, refinar e ordenar tudo é mais barato
+    FUZZY_MAX_POSTING = 2048   # trigramas mais comuns que isso não ajudam a achar o nome
+
+    def __init__(self, bosses: List[BossRecord]):
+        self.keys: List[str] = []
+        self.grams: Dict[str, List[int]] = {}        # n-grama em qualquer posição
+        self.word_starts: Dict[str, List[int]] = {}  # n-grama no início de uma palavra
+        self.starts: Dict[str, List[int]] = {}       # n-grama no início da chave
+        for i, b in enumerate(bosses):
+            name = normalize_text(b.name)
+            slug = normalize_text(b.slug or "")
+            key = name if not slug or slug == name else f"{name} | {slug}"
+            self.keys.append(key)
+            seen, words = set(), set()
+            for n in (1, 2, 3):
+                for j in range(len(key) - n + 1):
+                    seen.add(key[j:j + n])
+                    if j == 0 or key[j - 1] == " ":
+                        words.add(key[j:j + n])
+            for g in seen:
+                self.grams.setdefault(g, []).append(i)   # listas já em ordem de id
+            for g in words:
+                self.word_starts.setdefault(g, []).append(i)
+            for n in (1, 2, 3):
+                if len(key) >= n:
+                    self.starts.setdefault(key[:n], []).append(i)
+        self._last_query = ""
+        self._last_ids: List[int] = []
+
+    @staticmethod
+    def _query_grams(q: str) -> List[str]:
+        if len(q) <= 3:
+            return [q]
+        return list({q[j:j + 3] for j in range(len(q) - 2)})
+
+    def _substring_ids(self, q: str) -> List[int]:
+        if len(q) <= 3:
+            ids = self.grams.get(q, [])                      # a própria lista já é o resultado
+            self._last_query, self._last_ids = q, ids
+            return ids
+        if self._last_query and q.startswith(self._last_query):
+            pool = self._last_ids                            # refinamento incremental
+        else:
+            lists = [self.grams.get(g) for g in self._query_grams(q)]
+            if any(lst is None for lst in lists):
+                pool = []
+            else:
+                lists.sort(key=len)
+                common = set(lists[0])
+                for lst in lists[1:]:
+                    common.intersection_update(lst)
+                    if not common:
+                        break
+                pool = sorted(common)
+        ids = [i for i in pool if q in self.keys[i]]
+        self._last_query, self._last_ids = q, ids
+        return ids
+
+    def _rank(self, q: str, i: int) -> int:
+        key = self.keys[i]
+        if key.startswith(q):
+            return 0
+        if f" {q}" in key:
+            return 1
+        return 2
+
+    def _ranked(self, q: str, limit: Optional[int]) -> List[int]:
+        """Contêm a consulta, por classe de _rank e depois por id; para no limite."""
+        refining = bool(self._last_query) and q.startswith(self._last_query)
+        if limit is None or (refining and len(self._last_ids) <= self.SMALL_POOL):
+            return sorted(self._substring_ids(q), key=lambda i: self._rank(q, i))
+        # início do nome / de palavra vêm das listas do prefixo (3 chars) da consulta;
+        # só se faltar resultado a lista completa de substrings é calculada
+        g = q[:3]
+        out: List[int] = []
+        for lst, r in ((self.starts.get(g, ()), 0), (self.word_starts.get(g, ()), 1), (None, 2)):
+            for i in (self._substring_ids(q) if lst is None else lst):
+                if self._rank(q, i) == r:
+                    out.append(i)
+                    if len(out) >= limit:
+                        return out
+        return out
+
+    def search(self, text: str, limit: Optional[int] = None, fuzzy: bool = True) -> List[int]:
+        """
+        Ids dos bosses que casam com 'text': primeiro os que contêm a consulta
+        (prefixo do nome, início de palavra, resto), depois os aproximados.
+        """
+        q = normalize_text(text)
+        if not q:
+            self._last_query, self._last_ids = "", []
+            return list(range(len(self.keys)))[:limit]
+        ranked = self._ranked(q, limit)
+        if not fuzzy or len(q) < 3 or (limit is not None and len(ranked) >= limit):
+            return ranked[:limit]
+        # aqui 'ranked' já tem todos os que contêm a consulta
+
+        lists = [lst for lst in (self.grams.get(g, ()) for g in self._query_grams(q))
+                 if len(lst) <= self.FUZZY_MAX_POSTING]
+        shared = Counter(chain.from_iterable(lists))
+        need = max(2 if len(lists) > 1 else 1, math.ceil(self.FUZZY_MIN_COVERAGE * len(lists)))
+        hits = set(ranked)
+        approx = sorted((i for i, c in shared.items() if c >= need and i not in hits),
+                        key=lambda i: (-shared[i], i))
+        return (ranked + approx)[:limit]
+
+
+# Selenium Helpers
+
+#  Espera por eventos no DOM (MutationObserver) no lugar de sleeps fixos
+FEEDBACK_ROW_SELECTOR = "[class*='content-row']"
+FEEDBACK_CELL_SELECTOR = "[class*='content-cell']"
+FEEDBACK_MIN_STATES = 6          # HP..Optional precisam estar coloridas
+FEEDBACK_TIMEOUT_SECS = 10.0
+SUGGESTION_SETTLE_SECS = 0.5     # teto; antes era um sleep fixo
+CANCEL_SLICE_SECS = 0.5          # granularidade das esperas canceláveis
+
+# resolve assim que existirem mais de 'minCount' elementos com o seletor
+_WAIT_FOR_COUNT_JS = """
+const [sel, minCount, timeoutMs, done] = arguments;
+const count = () => document.querySelectorAll(sel).length;
+if (count() > minCount) { done(count()); return; }
+let finished = false, timer = null;
+const obs = new MutationObserver(() => { if (count() > minCount) finish(); });
+function finish() {
+  if (finished) return;
+  finished = true; obs.disconnect(); clearTimeout(timer); done(count());
+}
+obs.observe(document.documentElement, {childList: true, subtree: true});
+timer = setTimeout(finish, timeoutMs);
+"""
+
+# resolve quando os textos da lista diferem do retrato 'before' (textos não
+# vazios unidos por \n, o mesmo formato de read_texts); false em timeout
+_WAIT_TEXTS_CHANGE_JS = """
+const [sel, before, timeoutMs, done] = arguments;
+const sig = () => Array.from(document.querySelectorAll(sel), e => (e.innerText || "").trim()).filter(t => t).join("\\n");
+if (sig() !== before) { done(true); return; }
+let finished = false, timer = null;
+const obs = new MutationObserver(() => { if (sig() !== before) finish(true); });
+function finish(ok) {
+  if (finished) return;
+  finished = true; obs.disconnect(); clearTimeout(timer); done(ok);
+}
+obs.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+timer = setTimeout(() => finish(false), timeoutMs);
+"""
+
+# marca as linhas de feedback existentes e devolve quantas são
+_MARK_ROWS_JS = """
+const rows = document.querySelectorAll(arguments[0]);
+rows.forEach(r => r.setAttribute("data-qs-seen", "1"));
+return rows.length;
+"""
+
+# resolve quando surge uma linha nova (não marcada, e o total cresceu) com as
+# células já coloridas; funciona com linhas inseridas no topo ou no fim
+_WAIT_NEW_ROW_JS = """
+const [rowSel, cellSel, minRows, minStates, timeoutMs, done] = arguments;
+const STATE = /\\b(green|orange|yellow|red)\\b/;
+function ready() {
+  const rows = document.querySelectorAll(rowSel);
+  if (rows.length <= minRows) return false;
+  for (const row of rows) {
+    if (row.hasAttribute("data-qs-seen")) continue;
+    let n = 0;
+    for (const c of row.querySelectorAll(cellSel)) if (STATE.test(c.getAttribute("class") || "")) n++;
+    if (n >= minStates) return true;
+  }
+  return false;
+}
+if (ready()) { done(true); return; }
+let finished = false, timer = null;
+const obs = new MutationObserver(() => { if (ready()) finish(true); });
+function finish(ok) {
+  if (finished) return;
+  finished = true; obs.disconnect(); clearTimeout(timer); done(ok);
+}
+obs.observe(document.documentElement, {childList: true, subtree: true, attributes: true, attributeFilter: ["class"]});
+timer = setTimeout(() => finish(false), timeoutMs);
+"""
+
+
+#  Leitura em lote: uma única chamada execute_script por passo
+
+# textos (não vazios) de todos os elementos do seletor
+_READ_TEXTS_JS = """
+return Array.from(document.querySelectorAll(arguments[0]), e => (e.innerText || "").trim()).filter(t => t);
+"""
+
+# classes/textos das células de feedback. Escopo: a linha nova (não marcada),
+# senão a linha 'fallbackRow' (0 = primeira, -1 = última), senão o documento.
+# Usa o primeiro seletor de célula com pelo menos 'limit' elementos.
+_READ_FEEDBACK_JS = """
+const [rowSel, cellSels, limit, fallbackRow] = arguments;
+const rows = Array.from(document.querySelectorAll(rowSel));
+const fresh = rows.filter(r => !r.hasAttribute("data-qs-seen"));
+const scopes = [];
+if (fresh.length === 1) scopes.push(fresh[0]);
+if (fallbackRow !== null && rows.length) scopes.push(rows[fallbackRow < 0 ? rows.length + fallbackRow : fallbackRow]);
+scopes.push(document);
+for (const scope of scopes) {
+  if (!scope) continue;
+  for (const sel of cellSels) {
+    const els = scope.querySelectorAll(sel);
+    if (els.length >= limit) {
+      return {selector: sel, cells: Array.from(els).slice(0, limit).map(
+        e => [e.getAttribute("class") || "", (e.innerText || "").trim()])};
+    }
+  }
+}
+return {selector: null, cells: []};
+"""
+
+
+def read_texts(driver, selector: str) -> List[str]:
+    """Textos de todos os elementos do seletor numa única ida ao navegador."""
+    try:
+        with trace_span("dom.read_texts", selector=selector):
+            return [str(t) for t in (driver.execute_script(_READ_TEXTS_JS, selector) or [])]
+    except Exception:
+        return []
+
+
+def read_feedback_cells(driver, cell_selectors: List[str], limit: int = 7,
+                        row_selector: str = FEEDBACK_ROW_SELECTOR,
+                        fallback_row: Optional[int] = None) -> Tuple[Optional[str], List[Tuple[str, str]]]:
+    """
+    Lê (classes, texto) das células de feedback numa única chamada execute_script.
+    Retorna (seletor usado, células); (None, []) se nenhum seletor bastou.
+    """
+    with trace_span("dom.read_feedback_cells"):
+        data = driver.execute_script(_READ_FEEDBACK_JS, row_selector, list(cell_selectors), limit, fallback_row) or {}
+    cells = [(str(c[0]), str(c[1])) for c in data.get("cells") or []]
+    return data.get("selector"), cells
+
+
+def _run_async(driver, script: str, timeout: float, *args):
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(script, *args, int(timeout * 1000))
+
+
+def wait_for_elements(driver, selector: str, min_count: int = 0, timeout: float = 5.0) -> int:
+    """Espera (sem polling) até haver mais de 'min_count' elementos; devolve a contagem."""
+    try:
+        with trace_span("dom.wait_for_elements", selector=selector):
+            return int(_run_async(driver, _WAIT_FOR_COUNT_JS, timeout, selector, min_count) or 0)
+    except Exception:
+        return 0
+
+
+def wait_for_texts_change(driver, selector: str, before: List[str], timeout: float = 5.0) -> bool:
+    """
+    Espera a lista do seletor mudar em relação a 'before' (retrato de read_texts).
+    Evita ler a lista do palpite anterior, que ainda está no DOM logo após digitar.
+    """
+    try:
+        with trace_span("dom.wait_for_texts_change", selector=selector):
+            return bool(_run_async(driver, _WAIT_TEXTS_CHANGE_JS, timeout, selector, "\n".join(before)))
+    except Exception:
+        return False
+
+
+def mark_feedback_rows(driver, row_selector: str = FEEDBACK_ROW_SELECTOR) -> int:
+    """Marca as linhas de feedback atuais (antes do palpite) e devolve quantas são."""
+    try:
+        with trace_span("dom.mark_feedback_rows"):
+            return int(driver.execute_script(_MARK_ROWS_JS, row_selector) or 0)
+    except Exception:
+        return 0
+
+
+@traced("dom.wait_for_new_feedback_row")
+def wait_for_new_feedback_row(driver, rows_before: int, timeout: float = FEEDBACK_TIMEOUT_SECS,
+                              row_selector: str = FEEDBACK_ROW_SELECTOR,
+                              cell_selector: str = FEEDBACK_CELL_SELECTOR,
+                              cancel: Optional[threading.Event] = None) -> bool:
+    """
+    Espera a linha de feedback do palpite aparecer já colorida. False em timeout.
+    Com 'cancel', espera em fatias curtas para poder ser interrompida.
+    """
+    deadline = time.perf_counter() + timeout
+    step = timeout if cancel is None else CANCEL_SLICE_SECS
+    try:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or (cancel is not None and cancel.is_set()):
+                return False
+            if _run_async(driver, _WAIT_NEW_ROW_JS, min(step, remaining), row_selector, cell_selector,
+                          rows_before, FEEDBACK_MIN_STATES):
+                return True
+    except Exception:
+        return False
+
+
+#  Pool de navegadores: caminho do driver em cache + sessões quentes
+DRIVER_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".driver_cache.json")
+DRIVER_MAX_USES = 20   # partidas por sessão antes de reciclar o navegador
+
+_DRIVER_PATH: Optional[str] = None
+
+
+def resolve_driver_path(refresh: bool = False) -> str:
+    """
+    Caminho do chromedriver. ChromeDriverManager().install() consulta a rede a
+    cada chamada; o resultado fica em memória e em DRIVER_CACHE_FILE.
+    """
+    global _DRIVER_PATH
+    if not refresh:
+        if _DRIVER_PATH and os.path.exists(_DRIVER_PATH):
+            return _DRIVER_PATH
+        try:
+            with open(DRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+                path = json.load(f).get("chromedriver")
+            if path and os.path.exists(path):
+                _DRIVER_PATH = path
+                return path
+        except (OSError, ValueError, AttributeError):
+            pass
+    if not load_selenium():
+        raise RuntimeError("Selenium/webdriver-manager não instalados")
+    _DRIVER_PATH = ChromeDriverManager().install()
+    try:
+        with open(DRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"chromedriver": _DRIVER_PATH}, f)
+    except OSError:
+        pass
+    return _DRIVER_PATH
+
+
+class DriverPool:
+    """
+    Sessões do Chrome mantidas abertas com a página do quiz carregada.
+    acquire() entrega uma sessão saudável (ou abre uma nova); release() recarrega
+    a página e devolve a sessão ao pool, ou a recicla depois de max_uses partidas.
+    warm_async() no startup deixa a primeira sessão pronta antes da primeira
+    partida; um acquire() durante o aquecimento espera por ela em vez de abrir outra.
+    """
+
+    def __init__(self, url: str, headless: bool = True, size: int = 1,
+                 max_uses: int = DRIVER_MAX_USES, configure=None):
+        self.url = url
+        self.headless = headless
+        self.size = size
+        self.max_uses = max_uses
+        self.configure = configure          # callback(options) para opções extras
+        self.closed = False
+        self._idle: List[Any] = []
+        self._live: Dict[int, List[Any]] = {}   # id(driver) -> [driver, partidas]
+        self._pending = 0                        # sessões sendo abertas por warm()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+
+    def _options(self):
+        opts = Options()
+        if self.headless:
+            opts.add_argument("--headless=new")
+        opts.add_argument("--no-sandbox")
+        opts.add_argument("--disable-dev-shm-usage")
+        if self.configure:
+            self.configure(opts)
+        return opts
+
+    def _launch(self):
+        try:
+            driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=self._options())
+        except Exception:
+            # o driver em cache pode não casar mais com um Chrome atualizado
+            driver = webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)), options=self._options())
+        driver.get(self.url)
+        with self._lock:
+            self._live[id(driver)] = [driver, 0]
+        return driver
+
+    def discard(self, driver):
+        """Fecha a sessão sem devolvê-la ao pool."""
+        with self._lock:
+            self._live.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def healthy(driver) -> bool:
+        """A sessão responde e a página terminou de carregar."""
+        try:
+            return driver.execute_script("return document.readyState") in ("interactive", "complete")
+        except Exception:
+            return False
+
+    def warm(self, n: Optional[int] = None) -> int:
+        """Abre sessões até haver 'n' (padrão: size) ociosas. Retorna quantas estão prontas."""
+        if not load_selenium():
+            return 0
+        target = self.size if n is None else n
+        while True:
+            with self._lock:
+                if self.closed or len(self._idle) + self._pending >= target:
+                    return len(self._idle)
+                self._pending += 1
+            driver = None
+            try:
+                driver = self._launch()
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                    if driver is not None:
+                        self._idle.append(driver)
+                    self._ready.notify_all()
+
+    def warm_async(self):
+        """warm() numa thread daemon (repõe sessões recicladas sem travar quem chamou)."""
+        def run():
+            try:
+                self.warm()
+            except Exception:
+                pass
+        threading.Thread(target=run, daemon=True).start()
+
+    def acquire(self):
+        """Entrega uma sessão com a página carregada; abre uma nova se não houver ociosa saudável."""
+        while True:
+            with self._lock:
+                while self._pending and not self._idle and not self.closed:
+                    self._ready.wait()   # aquecimento em andamento: espera a sessão dele
+                if self.closed:
+                    raise RuntimeError("DriverPool fechado")
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                return self._launch()
+            if self.healthy(driver):
+                return driver
+            self.discard(driver)
+
+    def release(self, driver):
+        """Devolve a sessão: recarrega a página para a próxima partida ou recicla."""
+        with self._lock:
+            entry = self._live.get(id(driver))
+            if entry is not None:
+                entry[1] += 1
+        if self.closed or entry is None or entry[1] >= self.max_uses or not self.healthy(driver):
+            self.discard(driver)
+            self.warm_async()
+            return
+        try:
+            driver.get(self.url)
+        except Exception:
+            self.discard(driver)
+            self.warm_async()
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(driver)
+                return
+        self.discard(driver)
+
+    def close(self):
+        """Fecha todas as sessões (ociosas e emprestadas)."""
+        with self._lock:
+            self.closed = True
+            drivers = [entry[0] for entry in self._live.values()]
+            self._idle.clear()
+            self._ready.notify_all()
+        for driver in drivers:
+            self.discard(driver)
+
+
+def chrome_profile(path: str):
+    """
+    'configure' do DriverPool que usa um diretório de perfil próprio do Chrome
+    (cookies/login de uma conta). O Chrome trava o perfil: um por sessão aberta.
+    """
+    def configure(opts):
+        opts.add_argument(f"--user-data-dir={os.path.abspath(path)}")
+    return configure
+
+
+_POOLS: Dict[Tuple[str, bool, Optional[str]], DriverPool] = {}
+
+
+def get_driver_pool(url: str, headless: bool = True, profile: Optional[str] = None) -> DriverPool:
+    """Pool compartilhado por (url, headless, perfil) dentro do processo."""
+    key = (url, headless, profile)
+    pool = _POOLS.get(key)
+    if pool is None or pool.closed:
+        pool = _POOLS[key] = DriverPool(url, headless=headless,
+                                        configure=chrome_profile(profile) if profile else None)
+    return pool
+
+
+@atexit.register
+def close_driver_pools():
+    for pool in list(_POOLS.values()):
+        pool.close()
+    _POOLS.clear()
 
-# Selenium Helpers 
 
 class SuggestionScraper:
-    def __init__(self, url: str, sel_suggestions: str, sel_input: str, sel_submit: str, headless: bool = True):
-        self.enabled = SELENIUM_OK
+    def __init__(self, url: str, sel_suggestions: str, sel_input: str, sel_submit: str, headless: bool = True,
+                 profile: Optional[str] = None):
+        self.enabled = selenium_available()
         self.driver = None
+        self.pool: Optional[DriverPool] = None
         self.url = url
         self.sel_suggestions = sel_suggestions
         self.sel_input = sel_input
         self.sel_submit = sel_submit
         self.headless = headless
+        self.profile = profile                   # diretório de perfil do Chrome (None = temporário)
+        self._rows_before: Optional[int] = None  # linhas de feedback antes do último palpite
+        self.cancel_event = threading.Event()    # sinalizado para abortar esperas longas
 
     def start(self) -> bool:
-        if not self.enabled:
+        # o import do Selenium acontece aqui (na thread do worker, na GUI)
+        if not self.enabled or not load_selenium():
+            self.enabled = False
             return False
         try:
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument("--headless=new")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.get(self.url)
+            # sessão quente do pool (página já carregada) em vez de um Chrome novo
+            self.pool = get_driver_pool(self.url, self.headless, self.profile)
+            self.driver = self.pool.acquire()
             return True
         except Exception:
             self.driver = None
             return False
 
-    def stop(self):
-        try:
-            if self.driver:
-                self.driver.quit()
-        except Exception:
-            pass
+    def stop(self, recycle: bool = True):
+        """
+        Devolve a sessão ao pool (que recarrega a página para a próxima partida);
+        com recycle=False fecha o navegador.
+        """
+        if self.driver and self.pool:
+            if recycle:
+                self.pool.release(self.driver)
+            else:
+                self.pool.discard(self.driver)
         self.driver = None
 
     def get_suggestions(self) -> List[str]:
         if not self.driver:
             return []
-        try:
-            els = self.driver.find_elements(By.CSS_SELECTOR, self.sel_suggestions)
-            names = [e.text.strip() for e in els if e.text.strip()]
-            return names
-        except Exception:
-            return []
+        return read_texts(self.driver, self.sel_suggestions)
 
+    @traced("SuggestionScraper.send_guess")
     def send_guess(self, guess: str) -> bool:
         if not self.driver:
             return False
@@ -323,8 +2168,11 @@ class SuggestionScraper:
             
             inp = None
             for selector in input_selectors:
+                if self.cancel_event.is_set():
+                    return False
                 try:
-                    inp = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+                    with trace_span("send_guess.probe_input", selector=selector):
+                        inp = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
                     break
                 except TimeoutException:
                     continue
@@ -332,11 +2180,16 @@ class SuggestionScraper:
             if not inp:
                 return False
                 
-            # Limpa e digita o palpite
-            inp.clear()
-            time.sleep(0.5)  # Pequena pausa
-            inp.send_keys(guess)
-            time.sleep(0.5)
+            # Marca as linhas atuais para reconhecer a do palpite depois
+            self._rows_before = mark_feedback_rows(self.driver)
+
+            # Limpa e digita o palpite; espera a lista de sugestões mudar (a do
+            # palpite anterior pode continuar no DOM e não serve de sinal)
+            stale = read_texts(self.driver, self.sel_suggestions)
+            with trace_span("send_guess.type"):
+                inp.clear()
+                inp.send_keys(guess)
+            wait_for_texts_change(self.driver, self.sel_suggestions, stale, timeout=SUGGESTION_SETTLE_SECS)
             
             # Tenta enviar
             if self.sel_submit:
@@ -350,9 +2203,12 @@ class SuggestionScraper:
                 ]
                 
                 for selector in button_selectors:
+                    if self.cancel_event.is_set():
+                        return False
                     try:
-                        btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                        btn.click()
+                        with trace_span("send_guess.probe_submit", selector=selector):
+                            btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+                            btn.click()
                         return True
                     except TimeoutException:
                         continue
@@ -368,6 +2224,7 @@ class SuggestionScraper:
             print(f"Erro no send_guess: {e}")
             return False
 
+    @traced("SuggestionScraper.get_feedback_from_site")
     def get_feedback_from_site(self) -> Dict[str, str]:
         """
         Captura o feedback automaticamente do site baseado nas classes CSS.
@@ -381,8 +2238,11 @@ class SuggestionScraper:
         try:
             feedback = {}
             
-            # Aguarda um pouco para garantir que a página atualizou após o palpite
-            time.sleep(1) 
+            # Aguarda a linha do palpite aparecer (retorna assim que o DOM muda)
+            if self._rows_before is not None:
+                if not wait_for_new_feedback_row(self.driver, self._rows_before, cancel=self.cancel_event):
+                    print("Nova linha de feedback não detectada a tempo; lendo o estado atual")
+                self._rows_before = None
             
             # Tenta diferentes seletores para encontrar as células
             possible_selectors = [
@@ -394,15 +2254,10 @@ class SuggestionScraper:
                 "div[class*='cell']"
             ]
             
-            cells = []
-            for selector in possible_selectors:
-                try:
-                    cells = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if len(cells) >= 7: 
-                        print(f"Células encontradas com seletor: {selector} ({len(cells)} células)")
-                        break
-                except:
-                    continue
+            # Uma única chamada ao navegador traz classes e textos de todas as células
+            selector, cells = read_feedback_cells(self.driver, possible_selectors, limit=7)
+            if selector:
+                print(f"Células encontradas com seletor: {selector}")
             
             if len(cells) < 7:  
                 print(f"células Insuficientes: {len(cells)} (precisa de pelo menos 7)")
@@ -421,9 +2276,7 @@ class SuggestionScraper:
             
             print(f"Processando {len(cells)} células encontradas:")
             
-            for i, cell in enumerate(cells[:7]):  # Pega apenas as primeiras 7 células
-                classes = cell.get_attribute("class") or ""
-                text = cell.text.strip()
+            for i, (classes, text) in enumerate(cells[:7]):  # Pega apenas as primeiras 7 células
                 print(f"Célula {i}: classes='{classes}' texto='{text}'")
                 
                 if i == 0:  # Pula NAME
@@ -463,60 +2316,379 @@ class SuggestionScraper:
             
         except Exception as e:
             print(f"Erro ao capturar feedback: {e}")
-            import traceback
             traceback.print_exc()
             return {}
 
 
 
+# Tabelas com linhas pré-alocadas
+
+class TableRowPool:
+    """
+    Linhas pré-alocadas de uma tabela DearPyGui. update() escreve só as células
+    que mudaram (set_value) e mostra/esconde linhas: nenhum item é criado ou
+    destruído depois do setup. 'kinds' define cada coluna: "text" ou "bar".
+    """
+
+    def __init__(self, table, n_rows: int, kinds: List[str], bar_width: int = 80):
+        self.rows = []
+        self.cells = []
+        self.values: List[List[Any]] = []
+        self.shown: List[bool] = []
+        for _ in range(n_rows):
+            row = dpg.add_table_row(parent=table, show=False)
+            self.rows.append(row)
+            self.cells.append([dpg.add_progress_bar(width=bar_width, parent=row) if kind == "bar"
+                               else dpg.add_text("", parent=row) for kind in kinds])
+            self.values.append([None] * len(kinds))
+            self.shown.append(False)
+
+    def update(self, data: List[List[Any]]):
+        """Mostra as primeiras len(data) linhas com esses valores e esconde o resto."""
+        for i, row in enumerate(self.rows):
+            values = data[i] if i < len(data) else None
+            if values is None:
+                if self.shown[i]:
+                    dpg.configure_item(row, show=False)
+                    self.shown[i] = False
+                continue
+            old = self.values[i]
+            for j, v in enumerate(values):
+                if old[j] != v:
+                    dpg.set_value(self.cells[i][j], v)
+                    old[j] = v
+            if not self.shown[i]:
+                dpg.configure_item(row, show=True)
+                self.shown[i] = True
+
+
+# Worker do navegador (fora da thread da GUI)
+
+class BrowserWorker:
+    """
+    Thread única que executa as operações do navegador em ordem (fila de comandos).
+    Os resultados voltam por outra fila e os callbacks rodam na thread da GUI,
+    em poll(), chamado uma vez por frame.
+
+    cancel() descarta os comandos pendentes e o resultado do comando em
+    andamento, e sinaliza cancel_event (checado pelo scraper entre as esperas).
+    Todo comando cancelado chega ao on_cancel: com o resultado, se já tinha
+    terminado, ou com None, se nem começou.
+    """
+
+    def __init__(self):
+        self.cancel_event = threading.Event()
+        self.current: Optional[Tuple[str, float]] = None   # (rótulo, início) do comando em andamento
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._results: "queue.Queue" = queue.Queue()
+        self._generation = 0
+        self._pending = 0                  # comandos na fila ou em execução
+        self._lock = threading.Lock()      # protege _pending/current entre submit, take e cancel
+        self._thread = threading.Thread(target=self._run, name="browser-worker", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        with self._lock:
+            return self._pending > 0
+
+    def submit(self, label: str, fn, on_done=None, on_cancel=None):
+        """
+        Enfileira fn(cancel_event). on_done(resultado) roda na GUI ao terminar;
+        on_cancel(resultado ou None) se o comando foi cancelado.
+        """
+        with self._lock:
+            self._pending += 1
+            self._jobs.put((self._generation, label, fn, on_done, on_cancel))
+
+    def cancel(self):
+        with self._lock:
+            self._generation += 1
+            self.cancel_event.set()
+            while True:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:          # sentinela do shutdown: volta para a fila
+                    self._jobs.put(None)
+                    break
+                self._skip(job)
+
+    def _skip(self, job):
+        """Comando descartado antes de rodar (chamar com _lock): só o on_cancel(None)."""
+        generation, label, _, _, on_cancel = job
+        self._pending -= 1
+        if on_cancel:
+            self._results.put((generation, label, None, None, None, on_cancel))
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            generation, label, fn, on_done, on_cancel = job
+            with self._lock:
+                if generation != self._generation:
+                    self._skip(job)
+                    continue
+                self.cancel_event.clear()
+                self.current = (label, time.perf_counter())
+            try:
+                with trace_span("worker.job", label=label):
+                    result, error = fn(self.cancel_event), None
+            except Exception as e:
+                result, error = None, e
+            self._results.put((generation, label, result, error, on_done, on_cancel))
+            with self._lock:
+                self.current = None
+                self._pending -= 1
+
+    def poll(self, on_error=None) -> int:
+        """Entrega os resultados prontos (thread da GUI). Retorna quantos foram processados."""
+        n = 0
+        while True:
+            try:
+                generation, label, result, error, on_done, on_cancel = self._results.get_nowait()
+            except queue.Empty:
+                return n
+            n += 1
+            try:
+                if generation != self._generation:
+                    if on_cancel and error is None:
+                        on_cancel(result)
+                elif error is not None:
+                    if on_error:
+                        on_error(label, error)
+                elif on_done:
+                    on_done(result)
+            except Exception as e:
+                # um callback com erro não pode derrubar o loop da GUI
+                if on_error:
+                    on_error(label, e)
+                else:
+                    traceback.print_exception(type(e), e, e.__traceback__)
+
+    def shutdown(self):
+        self.cancel()
+        self._jobs.put(None)
+
+
+# Diário da sessão (retomada após crash)
+
+SESSION_JOURNAL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".session_journal.jsonl")
+
+
+class SessionJournal:
+    """
+    Diário append-only (JSONL) da partida em andamento: início, palpites,
+    feedback com o estado de restrições resultante, sugestões, desfazer/refazer
+    e fim. Cada linha vai para o SO na hora (flush); o feedback também faz
+    fsync. Uma partida nova recomeça o arquivo.
+    Um erro de E/S (diretório só leitura, disco cheio) desliga o diário e
+    avisa on_error(erro); o jogo segue sem ele.
+    """
+
+    def __init__(self, path: str = SESSION_JOURNAL_FILE, on_error=None):
+        self.path = path
+        self.enabled = True
+        self.on_error = on_error
+        self._file = None
+
+    def begin(self, **meta):
+        self.close()
+        if not self.enabled:
+            return
+        try:
+            self._file = open(self.path, "w", encoding="utf-8")
+        except OSError as e:
+            self._fail(e)
+            return
+        self.write("start", time=time.time(), **meta)
+
+    def write(self, kind: str, fsync: bool = False, **data):
+        if not self.enabled:
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps({"t": kind, **data}, ensure_ascii=False) + "\n")
+            self._file.flush()
+            if fsync:
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            self._fail(e)
+
+    def end(self, reason: str):
+        self.write("end", fsync=True, reason=reason)
+        self.close()
+
+    def close(self):
+        f, self._file = self._file, None
+        if f is not None:
+            try:
+                f.close()
+            except OSError:
+                pass
+
+    def _fail(self, error: OSError):
+        self.enabled = False
+        self.close()
+        if self.on_error:
+            self.on_error(error)
+
+    @staticmethod
+    def read(path: str = SESSION_JOURNAL_FILE) -> List[Dict[str, Any]]:
+        """Registros do diário; uma última linha cortada pelo crash é ignorada."""
+        records = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break
+        except OSError:
+            pass
+        return records
+
+    @staticmethod
+    def unfinished(records: List[Dict[str, Any]]) -> bool:
+        """
+        True se o diário tem uma partida iniciada, com jogadas, e sem registro de
+        fim depois da última jogada. Desfazer após o acerto reabre a partida;
+        refazer até voltar ao estado do fim a fecha de novo.
+        """
+        if not records or records[0].get("t") != "start":
+            return False
+        kinds = [r.get("t") for r in records]
+        if "attempt" not in kinds:
+            return False
+        last_end = max((i for i, k in enumerate(kinds) if k == "end"), default=-1)
+        if last_end < 0:
+            return True
+        after = kinds[last_end + 1:]
+        if "attempt" in after or "feedback" in after:
+            return True
+        return after.count("undo") > after.count("redo")   # ainda antes do estado final
+
+
+def replay_journal(solver: Solver, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reaplica o diário no Solver (sem tocar no site). Retorna tentativas feitas,
+    últimas sugestões, último palpite e divergências entre o estado gravado e o
+    recalculado.
+    """
+    solver.reset()
+    result: Dict[str, Any] = {"attempt": 0, "suggestions": None, "last_guess": None, "mismatches": 0}
+    names = solver.engine.name_index
+    for rec in records:
+        kind = rec.get("t")
+        if kind == "attempt":
+            result["attempt"] = rec["attempt"]
+            solver.last_guess_boss = result["last_guess"] = names.boss(rec["guess"])
+        elif kind == "feedback":
+            guess = names.boss(rec["guess"])
+            if guess is None:
+                continue
+            solver.apply(rec["feedback"], guess)
+            if "state" in rec and RestrictionState(rec["state"]) != solver.restrictions:
+                result["mismatches"] += 1
+        elif kind == "suggestions":
+            result["suggestions"] = rec.get("names") or None
+        elif kind == "undo":
+            solver.undo()
+        elif kind == "redo":
+            solver.redo()
+    return result
+
+
 # DearPyGui App
 
 
+
 class App:
     def __init__(self):
+        startup_mark("modulo")
+        load_dearpygui()
+        startup_mark("dearpygui")
         self.bosses = load_bosses()
-        self.filtered_bosses = self.bosses.copy()  
-        self.restrictions = build_restrictions_state()
-        self.current_ranking = []  
+        startup_mark("dataset")
+        self.filtered_bosses = self.bosses[:FILTERED_ROWS]
+        self._search_index: Optional[BossSearchIndex] = None
+        self.solver = Solver(self.bosses)
+        self.current_ranking = []  # só o top-k (tabela + melhor candidato)
+        self.suggestions: Optional[List[str]] = None
         self.attempt = 0
         self.max_attempts = 7
 
         # selenium 
         self.scraper: Optional[SuggestionScraper] = None
+        self.worker = BrowserWorker()   # operações do navegador fora da thread da GUI
+        self._busy_shown = ""
+        self._warm_key: Optional[Tuple[str, bool]] = None   # (url, headless) pré-aquecidos
 
         # DearPyGui IDs
-        self.ui = {}
+        self.ui = {"log_buffer": LogBuffer()}
+        self.top_rows: Optional[TableRowPool] = None       # criados em setup_gui
+        self.filtered_rows: Optional[TableRowPool] = None
+
+        # diário da partida: retoma uma sessão interrompida sem tocar no site
+        self.journal = SessionJournal(on_error=self._journal_failed)
+        self._resumed = False
+        self._resume_session()
+
+    def _journal_meta(self) -> Dict[str, Any]:
+        return {"dataset": self.solver.engine.version, "bosses": len(self.bosses),
+                "max_attempts": self.max_attempts}
+
+    def _journal_failed(self, error: OSError):
+        log(self.ui, f" Diário de sessão desligado ({error}); a partida segue sem retomada")
+
+    def _resume_session(self):
+        records = SessionJournal.read(self.journal.path)
+        if not SessionJournal.unfinished(records):
+            return
+        meta, current = records[0], self._journal_meta()
+        started = time.localtime(meta.get("time") or 0)
+        if time.strftime("%Y-%m-%d", started) != time.strftime("%Y-%m-%d"):
+            # o quiz é diário: a partida de ontem não vale para o desafio de hoje
+            log(self.ui, f" Diário de sessão de {time.strftime('%d/%m', started)} — não retomado (quiz novo hoje)")
+            return
+        same_data = meta.get("bosses") == current["bosses"] and (
+            str(current["dataset"]).startswith("mem-") or meta.get("dataset") == current["dataset"])
+        if not same_data:
+            log(self.ui, " Diário de sessão de outro dataset — não retomado")
+            return
+        t0 = time.perf_counter()
+        result = replay_journal(self.solver, records)
+        self.attempt = result["attempt"]
+        self.suggestions = result["suggestions"]
+        self._resumed = True
+        log(self.ui, f" Sessão retomada do diário: {self.attempt} tentativa(s), "
+                     f"{len(records)} registros em {1000 * (time.perf_counter() - t0):.1f}ms")
+        if result["mismatches"]:
+            log(self.ui, f" Atenção: {result['mismatches']} estado(s) do diário diferem do recalculado")
 
     #  GUI Helpers 
     def _update_attempt_counter(self):
         """Atualiza o contador de tentativas na interface."""
         dpg.set_value(self.ui["attempt_counter"], f"Tentativas: {self.attempt}/{self.max_attempts}")
 
+    @traced("App.refresh_top_table")
     def _refresh_top_table(self):
-        """Atualiza a tabela do top 10."""
-        # Limpa linhas antigas
-        rows = dpg.get_item_children(self.ui["table_top"])[1]
-        for r in rows:
-            dpg.delete_item(r)
-
-        top = self.current_ranking[:10]
-        for idx, (b, sc, bd) in enumerate(top, start=1):
-            row = dpg.add_table_row(parent=self.ui["table_top"])
-            dpg.add_text(str(idx), parent=row)
-            dpg.add_text(b["name"], parent=row)
-            dpg.add_text(f"{sc:.2f}", parent=row)
-            # Barra de progresso para o score
-            dpg.add_progress_bar(default_value=sc/15.0, width=80, parent=row)
-            dpg.add_text(str(b["hp"]), parent=row)
-            dpg.add_text(str(len(b["weapons"])), parent=row)
-            dpg.add_text(str(len(b["resistance"])), parent=row)
-            dpg.add_text(str(len(b["weakness"])), parent=row)
-            dpg.add_text(str(len(b["immunity"])), parent=row)
-            dpg.add_text("optional" if optional_to_int(b["optional"]) == 1 else "required", parent=row)
+        """Atualiza a tabela do top 10 (linhas pré-alocadas, só as células alteradas)."""
+        top = self.current_ranking[:TOP_K]
+        self.top_rows.update([
+            [str(idx), b.name, f"{sc:.2f}", sc / SCORE_SCALE,   # barra de progresso para o score
+             str(b.hp), str(b.wep_count), str(b.res_count), str(b.weak_count), str(b.imm_count),
+             b.optional_label]
+            for idx, (b, sc, bd) in enumerate(top, start=1)
+        ])
 
         if self.current_ranking:
             b, sc, bd = self.current_ranking[0]
-            dpg.set_value(self.ui["best_title"], f" Melhor candidato provável: {b['name']} (score {sc:.2f})")
+            dpg.set_value(self.ui["best_title"], f" Melhor candidato provável: {b.name} (score {sc:.2f})")
             detail = (f"HP: {bd['HP']:.3f} | "
                      f"Weapons: {bd['Weapons']:.3f} | "
                      f"Resistance: {bd['Resistance']:.3f}\n"
@@ -541,56 +2713,112 @@ class App:
 
     def _refresh_restrictions_panel(self):
         """Atualiza o painel de restrições."""
-        r = self.restrictions
+        r = self.solver.restrictions
+        c = self.solver.candidates
         text = []
-        text.append(f"HP: min={r['HP']['min']}, max={r['HP']['max']}")        
-        text.append(f"Weapons: exact={r['Weapons']['exact']}")        
+        text.append(f"Candidatos possíveis: {c.count()}/{c.n}")
+        text.append(f"HP: min={r['HP']['min']}, max={r['HP']['max']} ({c.count('HP')} cand.)")        
+        text.append(f"Weapons: exact={r['Weapons']['exact']} ({c.count('Weapons')} cand.)")        
         for k in ["Resistance", "Weakness", "Immunity"]:
             x = r[k]
-            text.append(f"{k}: exact={x['exact']} | close={x['close']} | not={x['not']}")
+            text.append(f"{k}: exact={x['exact']} | close={x['close']} | not={x['not']} ({c.count(k)} cand.)")
         opt = r["Optional"]["exact"]
         opt_text = "N/A" if opt is None else ("required" if opt == 0 else "optional")
-        text.append(f"Optional: {opt_text}")
+        text.append(f"Optional: {opt_text} ({c.count('Optional')} cand.)")
 
         dpg.set_value(self.ui["restr_text"], "\n".join(text))
 
+    @property
+    def search_index(self) -> BossSearchIndex:
+        # montado na primeira busca, fora do caminho de abertura da janela
+        if self._search_index is None:
+            self._search_index = BossSearchIndex(self.bosses)
+        return self._search_index
+
     def _filter_bosses(self, sender, app_data, user_data):
         """Filtro de busca manual."""
-        search_text = dpg.get_value(self.ui["search_input"]).lower()
-        if not search_text:
-            self.filtered_bosses = self.bosses.copy()
-        else:
-            self.filtered_bosses = [b for b in self.bosses if search_text in b["name"].lower()]
+        search_text = dpg.get_value(self.ui["search_input"])
+        # índice de n-gramas: custo por tecla não cresce com o dataset
+        ids = self.search_index.search(search_text, limit=FILTERED_ROWS)
+        self.filtered_bosses = [self.bosses[i] for i in ids]
         
         # Atualiza a tabela de bosses filtrados
         self._refresh_filtered_table()
 
+    @traced("App.refresh_filtered_table")
     def _refresh_filtered_table(self):
-        """Atualiza tabela com bosses filtrados."""
-        rows = dpg.get_item_children(self.ui["table_filtered"])[1]
-        for r in rows:
-            dpg.delete_item(r)
-
-        # Mostra apenas os primeiros 20 para não sobrecarregar
-        for b in self.filtered_bosses[:20]:
-            row = dpg.add_table_row(parent=self.ui["table_filtered"])
-            dpg.add_text(b["name"], parent=row)
-            dpg.add_text(str(b["hp"]), parent=row)
-            dpg.add_text(str(len(b["weapons"])), parent=row)
-            dpg.add_text(str(len(b["resistance"])), parent=row)
-            dpg.add_text(str(len(b["weakness"])), parent=row)
-            dpg.add_text(str(len(b["immunity"])), parent=row)
-            dpg.add_text("optional" if optional_to_int(b["optional"]) == 1 else "required", parent=row)
-
+        """Atualiza tabela com bosses filtrados (linhas pré-alocadas)."""
+        # Mostra apenas os primeiros FILTERED_ROWS para não sobrecarregar
+        self.filtered_rows.update([
+            [b.name, str(b.hp), str(b.wep_count), str(b.res_count), str(b.weak_count),
+             str(b.imm_count), b.optional_label]
+            for b in self.filtered_bosses[:FILTERED_ROWS]
+        ])
+
+    @traced("App.recompute_ranking")
     def _recompute_ranking(self, suggestions: Optional[List[str]] = None):
         """Recomputa o ranking e atualiza a GUI."""
-        self.current_ranking = rank_bosses(self.bosses, self.restrictions, suggestions_whitelist=suggestions)
+        self.suggestions = suggestions
+        self.current_ranking = self.solver.ranking(suggestions)
+        if self.solver.unresolved:
+            log(self.ui, f" Sugestões sem boss correspondente: {self.solver.unresolved}")
         self._refresh_top_table()
+        startup_mark("primeiro_ranking")
+
+    def _log_cache_stats(self):
+        """Uma linha por partida (fim ou PARAR BOT), não a cada recomputação."""
+        log(self.ui, f" Cache de rankings: {self.solver.cache.stats()}")
+
+    def _report_startup(self):
+        """Loga os marcos de startup e, se QUIZSOULS_STARTUP_REPORT aponta um arquivo, grava uma linha JSON."""
+        marks = " | ".join(f"{k} {v:.0f}ms" for k, v in STARTUP_MARKS.items())
+        log(self.ui, f" Startup: {marks}")
+        if TRACER.enabled:
+            log(self.ui, f" Tracing ligado: o trace será gravado em {TRACER.path} ao fechar")
+        path = os.environ.get(STARTUP_REPORT_ENV)
+        if path:
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"time": time.time(), "bosses": len(self.bosses),
+                                        "selenium_loaded": bool(SELENIUM_OK), **STARTUP_MARKS}) + "\n")
+            except OSError as e:
+                log(self.ui, f" Não foi possível gravar o relatório de startup: {e}")
+
+    def _worker_busy(self) -> bool:
+        """True (e avisa no log) se o navegador ainda está executando um comando."""
+        if self.worker.busy:
+            label = self.worker.current[0] if self.worker.current else "comando na fila"
+            log(self.ui, f" Aguarde: navegador ocupado ({label}) — ou clique em CANCELAR")
+            return True
+        return False
+
+    def _job_failed(self, label: str, error: Exception):
+        log(self.ui, f" Erro em '{label}': {error}")
+        traceback.print_exception(type(error), error, error.__traceback__)
+
+    def _run_callbacks(self, jobs):
+        """dpg.run_callbacks um a um: um callback com erro é logado e o loop segue."""
+        for job in jobs or ():
+            try:
+                dpg.run_callbacks([job])
+            except Exception as e:
+                self._job_failed(getattr(job[0], "__name__", "callback"), e)
+
+    def _update_busy_indicator(self):
+        """Mostra a operação do navegador em andamento (chamado a cada frame)."""
+        current = self.worker.current
+        text = f" {current[0]}... {time.perf_counter() - current[1]:.1f}s" if current else ""
+        if text != self._busy_shown:
+            self._busy_shown = text
+            dpg.set_value(self.ui["busy_text"], text)
+            dpg.configure_item(self.ui["busy_spinner"], show=bool(current))
+            dpg.configure_item(self.ui["btn_cancel"], show=bool(current))
 
     #  Callbacks 
     def cb_start_automation(self):
         """Callback para iniciar automação."""
-        self.start_automation()
+        if not self._worker_busy():
+            self.start_automation()
 
     def cb_stop_automation(self):
         """Callback para parar automação."""
@@ -598,53 +2826,100 @@ class App:
 
     def cb_do_attempt(self):
         """Callback para fazer uma tentativa."""
-        self.do_attempt()
+        if not self._worker_busy():
+            self.do_attempt()
 
     def cb_apply_feedback(self):
         """Callback para aplicar feedback."""
-        self.apply_feedback_and_update()
+        if not self._worker_busy():
+            self.apply_feedback_and_update()
 
     def cb_auto_feedback(self):
         """Callback para captura automática de feedback."""
-        self.auto_capture_feedback()
+        if not self._worker_busy():
+            self.auto_capture_feedback()
 
     def cb_reset_quiz(self):
         """Callback para resetar o quiz."""
-        self.reset_quiz()
+        if not self._worker_busy():
+            self.reset_quiz()
+
+    def cb_undo_feedback(self):
+        """Callback para desfazer o último feedback."""
+        if not self._worker_busy():
+            self.step_history(undo=True)
+
+    def cb_redo_feedback(self):
+        """Callback para refazer o feedback desfeito."""
+        if not self._worker_busy():
+            self.step_history(undo=False)
+
+    def cb_prewarm(self):
+        """Callback do opt-in de pré-aquecimento do navegador."""
+        self._prewarm_browser()
+
+    def cb_cancel_job(self):
+        """Callback para cancelar a operação do navegador em andamento."""
+        if self.worker.busy:
+            self.worker.cancel()
+            log(self.ui, " Operação do navegador cancelada")
 
     #  Fluxo 
     def start_automation(self):
         """Inicia a automação."""
-        self.attempt = 0
-        self.restrictions = build_restrictions_state()
-        dpg.set_value(self.ui["log"], "")
-        log(self.ui, " Bot iniciado")
+        resumed = self._resumed
+        if resumed:
+            # continua a partida retomada do diário (restrições e tentativas já restauradas)
+            self._resumed = False
+            log(self.ui, f" Bot iniciado (continuando a sessão: tentativa {self.attempt}/{self.max_attempts})")
+        else:
+            self.attempt = 0
+            self.solver.reset()
+            self.journal.begin(**self._journal_meta())
+            self.ui["log_buffer"].clear()
+            log(self.ui, " Bot iniciado")
 
         use_selenium = dpg.get_value(self.ui["cb_use_selenium"])
-        suggestions = None
+        suggestions = self.suggestions if resumed else None   # sessão retomada mantém as sugestões do diário
         
-        if use_selenium and SELENIUM_OK:
+        if use_selenium and selenium_available():
             url = dpg.get_value(self.ui["inp_url"])
             sel_sug = dpg.get_value(self.ui["inp_sel_sug"])
             sel_inp = dpg.get_value(self.ui["inp_sel_input"])
             sel_btn = dpg.get_value(self.ui["inp_sel_submit"])
             headless = dpg.get_value(self.ui["cb_headless"])
-            
-            self.scraper = SuggestionScraper(url, sel_sug, sel_inp, sel_btn, headless=headless)
-            ok = self.scraper.start()
-            
-            if ok:
+            # URL/headless mudaram depois do pré-aquecimento: aquela sessão não serve mais
+            self._drop_warm_pool(keep=(url, headless))
+            self._warm_key = None
+
+            scraper = SuggestionScraper(url, sel_sug, sel_inp, sel_btn, headless=headless)
+            scraper.cancel_event = self.worker.cancel_event
+
+            def open_browser(cancel):
+                if not scraper.start():
+                    return None
+                return scraper.get_suggestions()
+
+            def opened(found):
+                if not scraper.driver:
+                    log(self.ui, " Selenium falhou — seguindo sem ele")
+                    return
+                self.scraper = scraper
                 log(self.ui, " Selenium ON: sessão iniciada")
-                suggestions = self.scraper.get_suggestions()
-                if suggestions:
-                    log(self.ui, f" Sugestões encontradas: {suggestions}")
+                if found:
+                    log(self.ui, f" Sugestões encontradas: {found}")
                 else:
                     log(self.ui, " Sem sugestões (usando todos os bosses)")
-            else:
-                log(self.ui, " Selenium falhou — seguindo sem ele")
-                self.scraper = None
+                self._recompute_ranking(found or None)
+
+            # o navegador abre em segundo plano; o ranking inicial sai já sem sugestões
+            # cancelado depois de aberto: a devolução (recarrega a página) também
+            # roda no worker, não na thread da GUI
+            self.worker.submit("Abrindo navegador", open_browser, opened,
+                               on_cancel=lambda _: self.worker.submit("Devolvendo navegador",
+                                                                      lambda cancel: scraper.stop()))
         else:
-            if use_selenium and not SELENIUM_OK:
+            if use_selenium and not selenium_available():
                 log(self.ui, " Selenium não disponível neste ambiente.")
             self.scraper = None
 
@@ -660,13 +2935,43 @@ class App:
         dpg.enable_item(self.ui["btn_stop"])
         dpg.enable_item(self.ui["btn_reset"])
         dpg.disable_item(self.ui["btn_start"])
+        self._update_history_buttons()
+
+    def _prewarm_browser(self):
+        """
+        Opt-in ("Pré-aquecer navegador"): abre em segundo plano a sessão que o
+        INICIAR BOT vai usar, com a URL/headless atuais.
+        """
+        if not dpg.get_value(self.ui["cb_prewarm"]):
+            self._drop_warm_pool()
+            return
+        if not dpg.get_value(self.ui["cb_use_selenium"]) or not selenium_available():
+            log(self.ui, " Pré-aquecimento exige o Selenium")
+            return
+        key = (dpg.get_value(self.ui["inp_url"]), dpg.get_value(self.ui["cb_headless"]))
+        self._drop_warm_pool(keep=key)
+        self._warm_key = key
+        get_driver_pool(*key).warm_async()
+        log(self.ui, " Aquecendo o navegador em segundo plano")
+
+    def _drop_warm_pool(self, keep: Optional[Tuple[str, bool]] = None):
+        """Fecha (no worker) o pool pré-aquecido se ele não for o de 'keep'."""
+        if self._warm_key is None or self._warm_key == keep:
+            return
+        pool = _POOLS.get((*self._warm_key, None))
+        self._warm_key = None
+        if pool is not None:
+            self.worker.submit("Fechando navegador pré-aquecido", lambda cancel: pool.close())
 
     def stop_automation(self):
         """Para a automação."""
+        self.worker.cancel()
         if self.scraper:
-            self.scraper.stop()
+            scraper = self.scraper
+            self.worker.submit("Devolvendo navegador", lambda cancel: scraper.stop())
             self.scraper = None
         log(self.ui, " Bot parado")
+        self._log_cache_stats()
         
         # Controles da interface 
         dpg.disable_item(self.ui["btn_attempt"])
@@ -674,12 +2979,14 @@ class App:
         dpg.disable_item(self.ui["btn_auto_feedback"])
         dpg.disable_item(self.ui["btn_stop"])
         dpg.disable_item(self.ui["btn_reset"])
+        dpg.disable_item(self.ui["btn_undo"])
+        dpg.disable_item(self.ui["btn_redo"])
         dpg.enable_item(self.ui["btn_start"])
 
     def reset_quiz(self):
         """Reseta o quiz completamente."""
         self.attempt = 0
-        self.restrictions = build_restrictions_state()
+        self.solver.reset()
         self.current_ranking = []
         
         # Atualiza contador
@@ -694,12 +3001,15 @@ class App:
         dpg.set_value(self.ui["last_guess"], "")
         
         # Limpar log
-        dpg.set_value(self.ui["log"], "")
+        self.ui["log_buffer"].clear()
         
+        self.journal.begin(**self._journal_meta())
+        self._resumed = False
         log(self.ui, " Quiz resetado")  
         # Sempre recomputa o ranking após reset
         self._recompute_ranking()
         self._refresh_restrictions_panel()
+        self._update_history_buttons()
 
     def do_attempt(self):
         """Executa uma tentativa."""
@@ -710,33 +3020,47 @@ class App:
             log(self.ui, " Sem candidatos no ranking atual.")
             return
 
+        choice = self.solver.choose_guess(dpg.get_value(self.ui["guess_mode"]), self.suggestions)
+        if choice is None:
+            log(self.ui, " Nenhum candidato entre as sugestões atuais.")
+            return
         self.attempt += 1
-        top_boss, top_score, _ = self.current_ranking[0]
+        top_boss, top_score, gain = choice
+        self.journal.write("attempt", attempt=self.attempt, guess=top_boss.name)
 
         # Atualiza contador
         self._update_attempt_counter()
 
         log(self.ui, f" Tentativa {self.attempt}/{self.max_attempts}")
-        log(self.ui, f" Palpite escolhido: {top_boss['name']} (Score: {top_score:.2f})")
+        log(self.ui, f" Palpite escolhido: {top_boss.name} (Score: {top_score:.2f})")
+        if gain is not None:
+            log(self.ui, f" Informação esperada: {gain:.2f} bits ({self.solver.candidates.count()} candidatos)")
 
-        # Se selenium ativo, envia palpite
+        # Se selenium ativo, envia palpite (em segundo plano)
         if self.scraper:
-            ok = self.scraper.send_guess(top_boss["name"])
-            if ok:
-                log(self.ui, " Palpite enviado ao site (aguardando feedback).")
-            else:
-                log(self.ui, " Falha ao enviar palpite ao site (forneça feedback manual).")
-
-        guess_info = (f" {top_boss['name']}\n"
-                     f"HP: {top_boss['hp']} | Weapons: {len(top_boss['weapons'])} | "
-                     f"Res: {len(top_boss['resistance'])} | Weak: {len(top_boss['weakness'])}\n"
-                     f"Imm: {len(top_boss['immunity'])} | "
-                     f"Type: {'optional' if optional_to_int(top_boss['optional']) else 'required'}")
+            scraper, name = self.scraper, top_boss.name
+            self.worker.submit(f"Enviando palpite {name}", lambda cancel: scraper.send_guess(name),
+                               self._guess_sent)
+
+        self._show_last_guess(top_boss)
+
+    def _show_last_guess(self, boss: BossRecord):
+        guess_info = (f" {boss.name}\n"
+                     f"HP: {boss.hp} | Weapons: {boss.wep_count} | "
+                     f"Res: {boss.res_count} | Weak: {boss.weak_count}\n"
+                     f"Imm: {boss.imm_count} | "
+                     f"Type: {boss.optional_label}")
         dpg.set_value(self.ui["last_guess"], guess_info)
 
+    def _guess_sent(self, ok: bool):
+        if ok:
+            log(self.ui, " Palpite enviado ao site (aguardando feedback).")
+        else:
+            log(self.ui, " Falha ao enviar palpite ao site (forneça feedback manual).")
+
     def auto_capture_feedback(self):
         """
-        Captura feedback automaticamente e aplica às restrições.
+        Captura feedback automaticamente (em segundo plano) e aplica às restrições.
         """
         if not self.scraper:
             log(self.ui, " Selenium nao esta ativo para captura automatica.")
@@ -745,10 +3069,20 @@ class App:
         if not self.current_ranking:
             log(self.ui, " Nenhum ranking atual para aplicar feedback.")
             return False
-        
-        # Captura feedback do site
-        feedback = self.scraper.get_feedback_from_site()
-        
+
+        scraper = self.scraper
+
+        def capture(cancel):
+            feedback = scraper.get_feedback_from_site()
+            suggestions = scraper.get_suggestions() if feedback and not cancel.is_set() else []
+            return feedback, suggestions
+
+        self.worker.submit("Capturando feedback", capture, self._feedback_captured)
+        return True
+
+    def _feedback_captured(self, result: Tuple[Dict[str, str], List[str]]):
+        """Aplica o feedback capturado pelo worker (thread da GUI)."""
+        feedback, suggestions = result
         if not feedback:
             log(self.ui, " Nao foi possivel capturar feedback do site.")
             return False
@@ -773,18 +3107,23 @@ class App:
             if value != "—":
                 log(self.ui, f"   {attr}: {value}")
         
-        # Aplica o feedback normalmente
-        self.apply_feedback_and_update()
+        # Aplica o feedback normalmente (sugestões já lidas junto com o feedback)
+        self.apply_feedback_and_update(prefetched=suggestions)
         
         return True
 
-    def apply_feedback_and_update(self):
-        """Aplica feedback e atualiza ranking."""
+    @traced("App.apply_feedback_and_update")
+    def apply_feedback_and_update(self, prefetched: Optional[List[str]] = None):
+        """
+        Aplica feedback e atualiza ranking. Sem 'prefetched', as sugestões são
+        lidas do site pelo worker e o ranking é refeito quando chegarem.
+        """
         if not self.current_ranking:
             log(self.ui, " Nenhum ranking atual para aplicar feedback.")
             return
 
-        guess_boss = self.current_ranking[0][0]
+        # boss realmente enviado em do_attempt (no modo informação nem sempre é o top 1)
+        guess_boss = self.solver.last_guess_boss or self.current_ranking[0][0]
 
         # Mapear feedback em texto para símbolos internos 
         feedback_mapping = {
@@ -817,26 +3156,65 @@ class App:
             if v and v != "—":
                 log(self.ui, f"  {k}: {v}")
 
-        apply_feedback_to_restrictions(self.restrictions, fb, guess_boss)
+        conflicts = self.solver.apply(fb, guess_boss)
+        self.journal.write("feedback", fsync=True, guess=guess_boss.name, feedback=fb,
+                           state=self.solver.restrictions.rules)
+        if conflicts:
+            log(self.ui, f" Feedback contraditório em {conflicts} — eliminação ignorada")
 
         # Sugestões
-        suggestions = None
+        if self.scraper and prefetched is None:
+            scraper = self.scraper
+            # cancelado: o solver já recebeu o feedback, então a GUI e o diário
+            # são atualizados mesmo assim (sem sugestões)
+            self.worker.submit("Lendo sugestões", lambda cancel: scraper.get_suggestions(),
+                               lambda found: self._finish_feedback(fb, guess_boss, found),
+                               on_cancel=lambda _: self._finish_feedback(fb, guess_boss, None))
+            return
+        self._finish_feedback(fb, guess_boss, prefetched)
+
+    def step_history(self, undo: bool = True):
+        """Desfaz/refaz um feedback; o ranking do estado volta do histórico sem recalcular."""
+        moved = self.solver.undo() if undo else self.solver.redo()
+        if not moved:
+            log(self.ui, " Nada para desfazer" if undo else " Nada para refazer")
+            return
+        log(self.ui, " Feedback desfeito" if undo else " Feedback refeito")
+        self.journal.write("undo" if undo else "redo")
+        self._recompute_ranking(self.solver.last_suggestions)
+        self._refresh_restrictions_panel()
+        self._update_history_buttons()
+
+    def _update_history_buttons(self):
+        dpg.configure_item(self.ui["btn_undo"], enabled=self.solver.can_undo)
+        dpg.configure_item(self.ui["btn_redo"], enabled=self.solver.can_redo)
+
+    def _finish_feedback(self, fb: Dict[str, str], guess_boss: BossRecord,
+                         suggestions: Optional[List[str]]):
+        """Reclassifica com as sugestões do site e verifica o fim do quiz."""
         if self.scraper:
-            suggestions = self.scraper.get_suggestions()
             if suggestions:
                 log(self.ui, f" Sugestões atualizadas: {suggestions}")
             else:
                 log(self.ui, " Sem sugestões (usando todos os bosses)")
+        suggestions = suggestions or None
+        self.journal.write("suggestions", names=suggestions)
 
         # Reclassifica
         self._recompute_ranking(suggestions)
         self._refresh_restrictions_panel()
+        self._update_history_buttons()
 
         # Verifica se encontrou o boss
         if (fb.get("HP") == "IGUAL" and fb.get("Weapons") == "IGUAL" and 
             fb.get("Resistance") == "IGUAL" and fb.get("Weakness") == "IGUAL" and 
             fb.get("Immunity") == "IGUAL" and fb.get("Optional") == "IGUAL"):
-            log(self.ui, f"\nBOSS ENCONTRADO: {guess_boss['name']}!\n")
+            log(self.ui, f"\nBOSS ENCONTRADO: {guess_boss.name}!\n")
+            self.journal.end("solved")
+            self._log_cache_stats()
+        elif self.attempt >= self.max_attempts:
+            self.journal.end("attempts")
+            self._log_cache_stats()
 
         if self.attempt >= self.max_attempts:
             log(self.ui, "\n Fim das tentativas. Ranking final calculado.")
@@ -873,9 +3251,18 @@ class App:
                               width=150, enabled=False)
                 self.ui["btn_auto_feedback"] = dpg.add_button(label="CAPTURAR FEEDBACK", callback=self.cb_auto_feedback,
                               width=160, enabled=False)
+                self.ui["btn_undo"] = dpg.add_button(label="DESFAZER", callback=self.cb_undo_feedback,
+                              width=90, enabled=False)
+                self.ui["btn_redo"] = dpg.add_button(label="REFAZER", callback=self.cb_redo_feedback,
+                              width=90, enabled=False)
                 self.ui["btn_reset"] = dpg.add_button(label="RESET QUIZ", callback=self.cb_reset_quiz,
                               width=120, enabled=False)
                 self.ui["attempt_counter"] = dpg.add_text(f"Tentativas: 0/{self.max_attempts}")
+                # Progresso / cancelamento das operações do navegador
+                self.ui["busy_spinner"] = dpg.add_loading_indicator(radius=1.5, style=1, show=False)
+                self.ui["busy_text"] = dpg.add_text("")
+                self.ui["btn_cancel"] = dpg.add_button(label="CANCELAR", callback=self.cb_cancel_job,
+                              width=90, show=False)
 
             dpg.add_separator()
 
@@ -886,11 +3273,16 @@ class App:
                 with dpg.child_window(width=350, height=800):
                     dpg.add_text("CONFIGURACOES", color=[100, 200, 255])
                     dpg.add_separator()
+
+                    dpg.add_text("Modo de palpite:")
+                    self.ui["guess_mode"] = dpg.add_combo(items=GUESS_MODES, default_value=GUESS_MODES[0], width=-1)
                     
                     # Selenium Config
                     with dpg.collapsing_header(label="Configuracao Selenium", default_open=False):
                         self.ui["cb_use_selenium"] = dpg.add_checkbox(label="Usar Selenium", default_value=True)
                         self.ui["cb_headless"] = dpg.add_checkbox(label="Modo Headless", default_value=False)
+                        self.ui["cb_prewarm"] = dpg.add_checkbox(label="Pré-aquecer navegador", default_value=False,
+                                                                 callback=self.cb_prewarm)
                         dpg.add_text("URL do Quiz:")
                         self.ui["inp_url"] = dpg.add_input_text(default_value="https://daily-souls.netlify.app/classic/", width=-1)
                         dpg.add_text("Seletor Sugestoes:")
@@ -986,6 +3378,7 @@ class App:
                     dpg.add_table_column(label="Weak", parent=self.ui["table_top"], width_fixed=True, init_width_or_weight=50)
                     dpg.add_table_column(label="Imm", parent=self.ui["table_top"], width_fixed=True, init_width_or_weight=40)
                     dpg.add_table_column(label="Opt", parent=self.ui["table_top"], width_fixed=True, init_width_or_weight=70)
+                    self.top_rows = TableRowPool(self.ui["table_top"], TOP_K, ["text"] * 3 + ["bar"] + ["text"] * 6)
 
                 # COLUNA DIREITA - Log e Busca
                 with dpg.child_window(width=480, height=800):
@@ -1010,6 +3403,7 @@ class App:
                     dpg.add_table_column(label="Wk", parent=self.ui["table_filtered"], width_fixed=True, init_width_or_weight=30)
                     dpg.add_table_column(label="Im", parent=self.ui["table_filtered"], width_fixed=True, init_width_or_weight=30)
                     dpg.add_table_column(label="Opt", parent=self.ui["table_filtered"], width_fixed=True, init_width_or_weight=60)
+                    self.filtered_rows = TableRowPool(self.ui["table_filtered"], FILTERED_ROWS, ["text"] * 7)
 
                     dpg.add_separator()
 
@@ -1023,6 +3417,8 @@ class App:
         self._refresh_filtered_table()
         self._refresh_restrictions_panel()
         self._update_attempt_counter()
+        if self._resumed and self.solver.last_guess_boss:
+            self._show_last_guess(self.solver.last_guess_boss)
 
         # Aplica tema
         dpg.bind_theme(global_theme)
@@ -1038,16 +3434,39 @@ class App:
         
         log(self.ui, f" QuizSoulsLOL iniciado!")
         log(self.ui, f" Bosses carregados: {len(self.bosses)}")
-        if not SELENIUM_OK:
+        if not selenium_available():
             log(self.ui, " Selenium nao disponivel - modo offline apenas")
         else:
             log(self.ui, " Selenium disponivel - captura automatica ativada!")
         
-        dpg.start_dearpygui()
-        dpg.destroy_context()
+        # Loop manual: callbacks, resultados do worker e render na mesma thread
+        dpg.configure_app(manual_callback_management=True)
+        try:
+            dpg.render_dearpygui_frame()
+            startup_mark("janela")
+            # ranking inicial logo depois do primeiro frame, para a janela não
+            # esperar por ele (numa sessão retomada, com as sugestões do diário)
+            self._recompute_ranking(self.suggestions)
+            self._report_startup()
+            while dpg.is_dearpygui_running():
+                self._run_callbacks(dpg.get_callback_queue())
+                self.worker.poll(on_error=self._job_failed)
+                self._update_busy_indicator()
+                self.ui["log_buffer"].flush(self.ui)
+                dpg.render_dearpygui_frame()
+        finally:
+            self.worker.shutdown()
+            self.journal.close()
+            dpg.destroy_context()
 
 # Main Entry Point
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--build-cache":
+        # python QuizSoulsLOL.py --build-cache [bosses.json ...]
+        sources = sys.argv[2:] or [f for f in ("bosses_indexed.json", "bosses.json") if os.path.exists(f)]
+        for src in sources:
+            print(f"{src} -> {build_dataset_cache(src)}")
+        sys.exit(0)
     app = App()
     app.run()
\ No newline at end of file
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor local que imita o modo classic do Daily Souls, para testar os
+scrapers offline e medir latência de forma reproduzível.
+
+Serve o mesmo DOM que QuizSoulsLOL.py / QuizSoulsV1.py procuram: o 'input',
+a lista de sugestões (.page-button__list li / .suggestion), o botão submit e
+as linhas .categories__content-row com células green/orange/red/arrow-up/
+arrow-down. O feedback vem de simulate_feedback sobre o bosses.json.
+
+Uso:
+    python QuizSoulsServer.py [--port 8765] [--target slug] [--latency-ms 0]
+    python QuizSoulsServer.py --bench 20      # mede round-trips com o SuggestionScraper
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse, parse_qs
+
+from QuizSoulsLOL import BossRecord, SuggestionScraper, load_bosses, simulate_feedback
+
+# feedback (vocabulário do solver) -> classes CSS da célula
+FEEDBACK_CLASSES = {
+    "IGUAL": "green",
+    "PERTO": "orange",
+    "DIFERENTE": "red",
+    "MAIOR": "red arrow-up",
+    "MENOR": "red arrow-down",
+}
+
+PAGE = """<!doctype html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Daily Souls (local)</title>
+<style>
+  body { background: #1e1e1e; color: #eee; font-family: sans-serif; }
+  .page-button__list { list-style: none; padding: 0; }
+  .page-button__list li { cursor: pointer; padding: 2px 6px; }
+  .categories__content-row { display: flex; gap: 4px; margin: 4px 0; }
+  .categories__content-cell { width: 110px; padding: 4px; border: 1px solid #555; }
+  .green { background: #2e7d32; } .orange { background: #ef6c00; } .red { background: #b71c1c; }
+  .arrow-up::after { content: " \\2191"; } .arrow-down::after { content: " \\2193"; }
+</style>
+</head>
+<body>
+<form class="page-form" autocomplete="off">
+  <input type="text" class="page-input" placeholder="Boss name">
+  <button type="submit" class="page-button">Guess</button>
+</form>
+<ul class="page-button__list"></ul>
+<div class="categories"><div class="categories__content"></div></div>
+<script>
+const NAMES = __NAMES__;
+const form = document.querySelector("form");
+const input = document.querySelector("input");
+const list = document.querySelector(".page-button__list");
+const rows = document.querySelector(".categories__content");
+const guessed = new Set();
+
+function matches(text) {
+  const t = text.trim().toLowerCase();
+  if (!t) return [];
+  return NAMES.filter(n => !guessed.has(n) && n.toLowerCase().includes(t)).slice(0, 10);
+}
+
+function renderSuggestions() {
+  list.innerHTML = "";
+  for (const name of matches(input.value)) {
+    const li = document.createElement("li");
+    li.className = "suggestion";
+    li.textContent = name;
+    li.addEventListener("click", () => submitGuess(name));
+    list.appendChild(li);
+  }
+}
+
+function cell(tag, cls, text) {
+  const el = document.createElement(tag);
+  el.className = "categories__content-cell " + cls;
+  el.textContent = text;
+  return el;
+}
+
+function addRow(data) {
+  const row = document.createElement("div");
+  row.className = "categories__content-row";
+  row.appendChild(cell("span", "categories__content-cell--image", ""));
+  for (const c of data.cells) row.appendChild(cell("div", c.cls, c.text));
+  rows.prepend(row);  // palpite mais recente no topo
+}
+
+async function submitGuess(name) {
+  const t = (name || input.value).trim().toLowerCase();
+  const exact = NAMES.find(n => n.toLowerCase() === t);
+  const chosen = exact || matches(t)[0];
+  if (!chosen || guessed.has(chosen)) return;
+  guessed.add(chosen);
+  input.value = "";
+  list.innerHTML = "";
+  const resp = await fetch("/api/guess", {method: "POST", body: JSON.stringify({name: chosen})});
+  const data = await resp.json();
+  addRow(data);
+  if (data.solved) input.disabled = true;
+}
+
+input.addEventListener("input", renderSuggestions);
+form.addEventListener("submit", ev => { ev.preventDefault(); submitGuess(); });
+</script>
+</body>
+</html>
+"""
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Servidor HTTP com uma partida (um alvo) por vez."""
+
+    daemon_threads = True
+
+    def __init__(self, address, bosses: List[BossRecord], target: Optional[str] = None,
+                 latency: float = 0.0, seed: Optional[int] = None):
+        super().__init__(address, _Handler)
+        self.bosses = bosses
+        self.by_name = {b.name: b for b in bosses}
+        self.latency = latency
+        self.rng = random.Random(seed)
+        names = json.dumps([b.name for b in bosses], ensure_ascii=False).replace("</", "<\\/")
+        self.page = PAGE.replace("__NAMES__", names).encode("utf-8")
+        self.target = self.bosses[0]
+        self.reset(target)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/classic/"
+
+    def reset(self, target: Optional[str] = None) -> BossRecord:
+        """Nova partida: alvo por nome/slug ou aleatório."""
+        chosen = None
+        if target:
+            chosen = next((b for b in self.bosses if target in (b.name, b.slug)), None)
+        self.target = chosen or self.rng.choice(self.bosses)
+        return self.target
+
+    def guess(self, name: str) -> Dict[str, Any]:
+        """Resposta do /api/guess: células na ordem NAME, HP, WEAPONS, ..., OPTIONAL."""
+        boss = self.by_name.get(name)
+        if boss is None:
+            return {"error": f"boss desconhecido: {name}"}
+        fb = simulate_feedback(boss, self.target)
+        values = [
+            ("NAME", boss.name),
+            ("HP", str(boss.hp)),
+            ("Weapons", ", ".join(boss.weapons) or "—"),
+            ("Resistance", ", ".join(boss.resistance) or "—"),
+            ("Weakness", ", ".join(boss.weakness) or "—"),
+            ("Immunity", ", ".join(boss.immunity) or "—"),
+            ("Optional", boss.optional_label),
+        ]
+        return {
+            "cells": [{"cls": FEEDBACK_CLASSES[fb[key]], "text": text} for key, text in values],
+            "solved": boss.name == self.target.name,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def log_message(self, fmt, *args):
+        pass  # silencioso
+
+    def _send(self, body: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, data: Dict[str, Any], status: int = 200):
+        self._send(json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json", status)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path in ("/", "/classic", "/classic/"):
+            self._send(self.server.page, "text/html; charset=utf-8")
+        elif url.path == "/api/reset":
+            target = parse_qs(url.query).get("target", [None])[0]
+            boss = self.server.reset(target)
+            self._send_json({"target": boss.name})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/api/guess":
+            self._send_json({"error": "not found"}, 404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            name = json.loads(self.rfile.read(length) or b"{}").get("name", "")
+        except ValueError:
+            self._send_json({"error": "json inválido"}, 400)
+            return
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        data = self.server.guess(name)
+        self._send_json(data, 400 if "error" in data else 200)
+
+
+def start_server(bosses: Optional[List[BossRecord]] = None, port: int = 0, **kwargs) -> StandInServer:
+    """Sobe o servidor numa thread daemon (port=0 escolhe uma porta livre)."""
+    server = StandInServer(("127.0.0.1", port), bosses or load_bosses(), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+#  Harness de latência
+
+def run_benchmark(server: StandInServer, rounds: int, headless: bool = True,
+                  guesses_per_game: int = 6) -> Dict[str, Any]:
+    """
+    Mede round-trips completos (send_guess + get_feedback_from_site) do
+    SuggestionScraper contra o servidor local.
+    """
+    scraper = SuggestionScraper(server.url, ".page-button__list li", "input[type='text']",
+                                "button[type='submit']", headless=headless)
+    if not scraper.start():
+        raise RuntimeError("Selenium/Chrome indisponível: não foi possível iniciar o navegador")
+
+    send_times, feedback_times, failures = [], [], 0
+    try:
+        pool = []
+        for i in range(rounds):
+            if i % guesses_per_game == 0:
+                target = server.reset()
+                pool = [b.name for b in server.bosses if b.name != target.name]
+                server.rng.shuffle(pool)
+                scraper.driver.get(server.url)
+            name = pool.pop()
+            t0 = time.perf_counter()
+            ok = scraper.send_guess(name)
+            t1 = time.perf_counter()
+            fb = scraper.get_feedback_from_site() if ok else {}
+            t2 = time.perf_counter()
+            if not fb:
+                failures += 1
+                continue
+            send_times.append(t1 - t0)
+            feedback_times.append(t2 - t1)
+    finally:
+        scraper.stop()
+
+    def stats(values: List[float]) -> Dict[str, float]:
+        if not values:
+            return {"mean": 0.0, "min": 0.0, "max": 0.0}
+        return {"mean": 1000 * sum(values) / len(values), "min": 1000 * min(values), "max": 1000 * max(values)}
+
+    totals = [a + b for a, b in zip(send_times, feedback_times)]
+    return {"rounds": rounds, "failures": failures, "send_guess_ms": stats(send_times),
+            "feedback_ms": stats(feedback_times), "round_trip_ms": stats(totals)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stand-in local do Daily Souls (modo classic).")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--dataset", help="JSON de bosses (padrão: bosses_indexed.json / bosses.json)")
+    parser.add_argument("--target", help="nome ou slug do boss alvo (padrão: aleatório)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="atraso artificial no /api/guess")
+    parser.add_argument("--bench", type=int, default=0, metavar="N",
+                        help="em vez de servir, mede N palpites com o SuggestionScraper")
+    parser.add_argument("--show", action="store_true", help="no --bench, abre o navegador visível")
+    args = parser.parse_args(argv)
+
+    bosses = load_bosses(args.dataset)
+    kwargs = dict(target=args.target, latency=args.latency_ms / 1000.0, seed=args.seed)
+    if args.bench:
+        server = start_server(bosses, port=0, **kwargs)
+        try:
+            report = run_benchmark(server, args.bench, headless=not args.show)
+        except RuntimeError as e:
+            print(e)
+            return 2
+        finally:
+            server.shutdown()
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    server = StandInServer(("127.0.0.1", args.port), bosses, **kwargs)
+    print(f"Servindo {len(bosses)} bosses em {server.url} (alvo: {server.target.name})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Simulador offline (self-play) do solver do QuizSoulsLOL.
+
+Joga cada boss do dataset como alvo escondido, usando um oráculo local de
+feedback (simulate_feedback) no lugar do site, e mede distribuição de
+tentativas, taxa de falha e tempo de cálculo por passo.
+As partidas são distribuídas num pool de processos.
+
+Uso:
+    python QuizSoulsSim.py [--mode score|info] [--workers N] [--json saida.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from QuizSoulsLOL import GUESS_MODES, TRACER, Solver, load_bosses, simulate_feedback, traced
+
+MODES = {"score": GUESS_MODES[0], "info": GUESS_MODES[1]}
+
+#  Estado por processo (montado uma vez pelo initializer do pool)
+_SOLVER: Optional[Solver] = None
+_MODE = GUESS_MODES[0]
+_MAX_ATTEMPTS = 7
+_MAX_GUESSES = 512
+
+
+def _init_worker(dataset: Optional[str], mode: str, max_attempts: int, max_guesses: int):
+    global _SOLVER, _MODE, _MAX_ATTEMPTS, _MAX_GUESSES
+    _SOLVER = Solver(load_bosses(dataset))
+    _MODE = mode
+    _MAX_ATTEMPTS = max_attempts
+    _MAX_GUESSES = max_guesses
+    if TRACER.enabled and multiprocessing.parent_process() is not None:
+        # workers do pool saem sem rodar o atexit; o Finalize roda no fim do processo
+        multiprocessing.util.Finalize(TRACER, TRACER.export, exitpriority=10)
+
+
+@traced("sim.play_game")
+def play_game(target_index: int) -> Dict[str, Any]:
+    """Joga uma partida com o boss de índice 'target_index' como alvo."""
+    solver = _SOLVER
+    solver.reset()
+    target = solver.bosses[target_index]
+    step_times = []
+    guesses = []
+    solved = False
+
+    for _ in range(_MAX_ATTEMPTS):
+        t0 = time.perf_counter()
+        choice = solver.choose_guess(_MODE, max_guesses=_MAX_GUESSES)
+        if choice is None:
+            step_times.append(time.perf_counter() - t0)
+            break
+        guess = choice[0]
+        feedback = simulate_feedback(guess, target)
+        guesses.append(guess.name)
+        if guess.name == target.name:
+            step_times.append(time.perf_counter() - t0)
+            solved = True
+            break
+        solver.apply(feedback, guess)
+        step_times.append(time.perf_counter() - t0)
+
+    return {
+        "target": target.name,
+        "solved": solved,
+        "attempts": len(guesses),
+        "guesses": guesses,
+        "step_times": step_times,
+    }
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def simulate(dataset: Optional[str] = None, mode: str = GUESS_MODES[0], max_attempts: int = 7,
+             workers: Optional[int] = None, max_guesses: int = 512) -> Dict[str, Any]:
+    """Joga todos os bosses como alvo e devolve o relatório agregado."""
+    n = len(load_bosses(dataset))
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    if workers <= 1:
+        _init_worker(dataset, mode, max_attempts, max_guesses)
+        games = [play_game(i) for i in range(n)]
+    else:
+        chunk = max(1, n // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(dataset, mode, max_attempts, max_guesses)) as pool:
+            games = list(pool.map(play_game, range(n), chunksize=chunk))
+    wall = time.perf_counter() - t0
+
+    steps = [t for g in games for t in g["step_times"]]
+    solved = [g for g in games if g["solved"]]
+    return {
+        "mode": mode,
+        "bosses": n,
+        "max_attempts": max_attempts,
+        "workers": workers,
+        "wall_seconds": wall,
+        "solved": len(solved),
+        "failure_rate": (n - len(solved)) / n if n else 0.0,
+        "mean_attempts": sum(g["attempts"] for g in solved) / len(solved) if solved else 0.0,
+        "attempt_distribution": dict(sorted(Counter(g["attempts"] for g in solved).items())),
+        "step_ms": {
+            "mean": 1000 * sum(steps) / len(steps) if steps else 0.0,
+            "p50": 1000 * _percentile(steps, 0.50),
+            "p95": 1000 * _percentile(steps, 0.95),
+            "max": 1000 * max(steps, default=0.0),
+        },
+        "failures": [g["target"] for g in games if not g["solved"]],
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Modo: {report['mode']} | bosses: {report['bosses']} | workers: {report['workers']} "
+        f"| tempo total: {report['wall_seconds']:.2f}s",
+        f"Resolvidos: {report['solved']}/{report['bosses']} "
+        f"(falhas: {100 * report['failure_rate']:.1f}%) | média de tentativas: {report['mean_attempts']:.2f}",
+        "Distribuição de tentativas:",
+    ]
+    total = max(report["bosses"], 1)
+    for attempts, count in report["attempt_distribution"].items():
+        lines.append(f"  {attempts}: {count:4d} {'#' * max(1, round(40 * count / total))}")
+    st = report["step_ms"]
+    lines.append(f"Tempo por passo (ms): média {st['mean']:.3f} | p50 {st['p50']:.3f} "
+                 f"| p95 {st['p95']:.3f} | max {st['max']:.3f}")
+    failures = report["failures"]
+    if failures:
+        extra = f" ... (+{len(failures) - 20})" if len(failures) > 20 else ""
+        lines.append(f"Falhas: {failures[:20]}{extra}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Self-play offline do solver QuizSouls.")
+    parser.add_argument("--dataset", help="JSON de bosses (padrão: bosses_indexed.json / bosses.json)")
+    parser.add_argument("--mode", choices=sorted(MODES), default="score", help="estratégia de palpite")
+    parser.add_argument("--max-attempts", type=int, default=7)
+    parser.add_argument("--max-guesses", type=int, default=512,
+                        help="palpites avaliados por passo no modo info")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: nº de CPUs)")
+    parser.add_argument("--json", help="grava o relatório completo neste arquivo")
+    parser.add_argument("--max-failure-rate", type=float, default=None,
+                        help="sai com código 1 se a taxa de falha passar deste valor (0-1)")
+    args = parser.parse_args(argv)
+
+    report = simulate(args.dataset, MODES[args.mode], args.max_attempts, args.workers, args.max_guesses)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.max_failure_rate is not None and report["failure_rate"] > args.max_failure_rate:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
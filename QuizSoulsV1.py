@@ -5,12 +5,11 @@ import random
 import json
 from collections import defaultdict
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+# o Selenium só é importado em start_driver(): importar este módulo (para usar o
+# score/ranking em outros scripts) não abre navegador nem carrega o Selenium
+from QuizSoulsLOL import (CandidateIndex, FEEDBACK_TIMEOUT_SECS, NameIndex, mark_feedback_rows,
+                          load_bosses, read_feedback_cells, read_texts, resolve_driver_path, trace_span, traced,
+                          wait_for_elements, wait_for_new_feedback_row, wait_for_texts_change)
 
 
 # CONFIGURAÇÕES BÁSICAS
@@ -19,6 +18,7 @@ URL = "https://daily-souls.netlify.app/classic/"
 MAX_ATTEMPTS = 7
 WAIT_SUGGESTIONS_SECS = 6
 TYPE_DELAY_RANGE = (0.15, 0.30)
+SUGGESTIONS_SELECTOR = ".page-button__list li"
 
 
 # ARQUIVOS
@@ -32,8 +32,15 @@ def _load_json(fname, default=None):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-boss_db = _load_json("bosses_indexed.json", default=[])
-legend = _load_json("legend.json", default={
+# bosses e legend vêm do dataset compilado (.qsd, recompilado quando um dos
+# dois JSONs muda); sem o arquivo de bosses, segue com a lista vazia
+_BOSSES_FILE = os.path.join(HERE, "bosses_indexed.json")
+if os.path.exists(_BOSSES_FILE):
+    bosses = load_bosses(_BOSSES_FILE)
+else:
+    print("Arquivo não encontrado: bosses_indexed.json. Usando valor padrão.")
+    bosses = []
+legend = getattr(bosses, "legend", None) or _load_json("legend.json", default={
     "resistance": {},
     "weakness": {},
     "immunity": {}
@@ -49,83 +56,78 @@ id_to_name = {
 
 # SELENIUM
 
-options = Options()
-options.add_experimental_option("detach", True)
-options.add_argument("--log-level=3")
-options.add_argument("--disable-logging")
-options.add_experimental_option("excludeSwitches", ["enable-logging"])
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-driver.get(URL)
-time.sleep(3)
+driver = None
+
+@traced("v1.start_driver")
+def start_driver():
+    """Abre o Chrome no site e espera o input aparecer."""
+    global driver
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    options = Options()
+    options.add_experimental_option("detach", True)
+    options.add_argument("--log-level=3")
+    options.add_argument("--disable-logging")
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    # caminho do chromedriver em cache (evita a consulta do webdriver-manager a cada execução)
+    driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=options)
+    driver.get(URL)
+    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "input")))
+    return driver
 
 
 # FUNÇÕES UTILITÁRIAS
 
-def normalize_boss(b):
-    """Normaliza os campos e calcula contagens usadas no jogo."""
-    return {
-        "slug": b.get("slug"),
-        "name": b.get("name"),
-        "hp": int(b.get("hp", 0)),
-        "optional": 0 if b.get("optional") == "required" else 1,
-        "resistance": b.get("resistance", [])[:],
-        "weakness": b.get("weakness", [])[:],
-        "immunity": b.get("immunity", [])[:],
-        "weapons": b.get("weapons", [])[:],
-        # métricas numéricas que o jogo usa
-        "res_count": len(b.get("resistance", [])),
-        "weak_count": len(b.get("weakness", [])),
-        "imm_count": len(b.get("immunity", [])),
-        "wep_count": len(b.get("weapons", [])),
-    }
-
-bosses = [normalize_boss(b) for b in boss_db]
+candidates = CandidateIndex(bosses)
+names = NameIndex(bosses)   # nome do site (caixa/apóstrofos/espaços) -> boss
 
 def get_suggestions():
-    try:
-        return [s.text.strip() for s in driver.find_elements(By.CSS_SELECTOR, ".page-button__list li") if s.text.strip()]
-    except:
+    return read_texts(driver, SUGGESTIONS_SELECTOR)
+
+@traced("v1.wait_for_suggestions")
+def wait_for_suggestions(timeout=WAIT_SUGGESTIONS_SECS, before=None):
+    # MutationObserver no navegador: retorna assim que a lista é preenchida
+    # (com 'before', só quando ela muda em relação a esse retrato)
+    if before is not None:
+        wait_for_texts_change(driver, SUGGESTIONS_SELECTOR, before, timeout=timeout)
+    elif not wait_for_elements(driver, SUGGESTIONS_SELECTOR, 0, timeout=timeout):
         return []
+    return get_suggestions()
 
-def wait_for_suggestions(timeout=WAIT_SUGGESTIONS_SECS):
-    start = time.time()
-    while time.time() - start < timeout:
-        s = get_suggestions()
-        if s:
-            return s
-        time.sleep(0.4)
-    return []
-
+@traced("v1.type_and_enter")
 def type_and_enter(text):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
     try:
         input_box = driver.find_element(By.CSS_SELECTOR, "input")
+        stale = get_suggestions()
         input_box.clear()
-        for ch in text:
-            input_box.send_keys(ch)
-            time.sleep(random.uniform(*TYPE_DELAY_RANGE))
-        time.sleep(random.uniform(0.5, 1.0))
+        with trace_span("v1.typing", chars=len(text)):
+            for ch in text:
+                input_box.send_keys(ch)
+                time.sleep(random.uniform(*TYPE_DELAY_RANGE))
+        # a digitação continua com ritmo humano; só a espera pelas sugestões é por evento
+        wait_for_texts_change(driver, SUGGESTIONS_SELECTOR, stale, timeout=1.0)
         input_box.send_keys(Keys.ENTER)
         return True
     except:
         return False
 
+@traced("v1.get_feedback")
 def get_feedback():
-    """Le a ultima linha da tabela de feedback e interpreta os ícones."""
+    """Le a linha do último palpite (numa única chamada ao navegador) e interpreta os ícones."""
     try:
-        rows = driver.find_elements(By.CSS_SELECTOR, ".categories__content-row")
-        if not rows:
+        _, cells = read_feedback_cells(driver, [".categories__content-cell"], limit=8,
+                                       row_selector=".categories__content-row", fallback_row=-1)
+        if len(cells) < 8:
             return None
-        last_row = rows[-1]
-        cells = last_row.find_elements(By.CSS_SELECTOR, ".categories__content-cell")
-        raw = {
-            "Boss Name": cells[1].get_attribute("class"),
-            "HP": cells[2].get_attribute("class"),
-            "Weapons": cells[3].get_attribute("class"),
-            "Resistance": cells[4].get_attribute("class"),
-            "Weakness": cells[5].get_attribute("class"),
-            "Immunity": cells[6].get_attribute("class"),
-            "Optional": cells[7].get_attribute("class"),
-        }
+        keys = ["Boss Name", "HP", "Weapons", "Resistance", "Weakness", "Immunity", "Optional"]
+        raw = {k: cells[i + 1][0] for i, k in enumerate(keys)}
         interp = {}
         for k, v in raw.items():
             if "green" in v:
@@ -158,16 +160,17 @@ def add_to_list_rule(rules, key, value):
     if value not in rules[key]:
         rules[key].append(value)
 
+@traced("v1.update_constraints_from_feedback")
 def update_constraints_from_feedback(guess_boss, feedback):
     """Atualiza restrições com base no feedback. Não elimina; apenas acumula 'pistas'."""
     # Valores observados para o palpite
     val = {
-        "HP": guess_boss["hp"],
-        "Weapons": guess_boss["wep_count"],
-        "Resistance": guess_boss["res_count"],
-        "Weakness": guess_boss["weak_count"],
-        "Immunity": guess_boss["imm_count"],
-        "Optional": guess_boss["optional"],
+        "HP": guess_boss.hp,
+        "Weapons": guess_boss.wep_count,
+        "Resistance": guess_boss.res_count,
+        "Weakness": guess_boss.weak_count,
+        "Immunity": guess_boss.imm_count,
+        "Optional": guess_boss.optional,
     }
     for attr, fb in feedback.items():
         if attr == "Boss Name":  # ignorado no sistema de pistas
@@ -185,6 +188,32 @@ def update_constraints_from_feedback(guess_boss, feedback):
             rules["close"] = x
         elif fb == "❌":
             add_to_list_rule(rules, "not", x)
+    eliminate_from_feedback(guess_boss, feedback)
+
+
+def eliminate_from_feedback(guess_boss, feedback):
+    """Feedback 'duro' (HP, contagem exata, Optional) elimina candidatos no índice de bitsets."""
+    g = guess_boss.hp
+    hp = feedback.get("HP")
+    if hp == "✅":
+        candidates.restrict("HP", candidates.hp_range_bits(g, g))
+    elif hp == "⬆️":
+        candidates.restrict("HP", candidates.hp_range_bits(g + 1, None))
+    elif hp == "⬇️":
+        candidates.restrict("HP", candidates.hp_range_bits(None, g - 1))
+
+    for attr, count_attr in CandidateIndex.COUNT_ATTRS.items():
+        if feedback.get(attr) == "✅":
+            candidates.restrict(attr, candidates.count_bits(attr, getattr(guess_boss, count_attr)))
+
+    opt = feedback.get("Optional")
+    if opt in ("✅", "❌"):
+        want = guess_boss.optional if opt == "✅" else 1 - guess_boss.optional
+        candidates.restrict("Optional", candidates.optional[want])
+
+    # algum atributo diferente → o palpite não é o alvo
+    if any(v != "✅" for v in feedback.values()):
+        candidates.exclude(guess_boss)
 
 
 # SISTEMA DE SCORE
@@ -233,37 +262,77 @@ def score_count(value, rules):
     # campos de contagem 
     return score_numeric(value, rules, weight_exact=1.0, weight_close=0.75, weight_range=0.65, weight_penalty=0.25)
 
-def composite_score(boss):
-    """Combina os scores de cada atributo com pesos."""
-    weights = {
-        "HP": 3.0,
-        "Weapons": 2.5,
-        "Resistance": 2.0,
-        "Weakness": 2.4,
-        "Immunity": 2.2,
-        "Optional": 1.2,
-    }
-    parts = {}
-    parts["HP"] = score_hp(boss["hp"], constraints["HP"])
-    parts["Weapons"] = score_count(boss["wep_count"], constraints["Weapons"])
-    parts["Resistance"] = score_count(boss["res_count"], constraints["Resistance"])
-    parts["Weakness"] = score_count(boss["weak_count"], constraints["Weakness"])
-    parts["Immunity"] = score_count(boss["imm_count"], constraints["Immunity"])
-    parts["Optional"] = score_count(boss["optional"], constraints["Optional"])
-
-    total = sum(parts[k] * weights[k] for k in parts)
+WEIGHTS = {
+    "HP": 3.0,
+    "Weapons": 2.5,
+    "Resistance": 2.0,
+    "Weakness": 2.4,
+    "Immunity": 2.2,
+    "Optional": 1.2,
+}
+FIELD_ATTRS = {"HP": "hp", "Weapons": "wep_count", "Resistance": "res_count",
+               "Weakness": "weak_count", "Immunity": "imm_count", "Optional": "optional"}
+
+
+# TABELAS DE SCORE (uma por estado de restrição)
+
+class ScoreTable(dict):
+    """valor do atributo -> score sob uma regra fixa; cada valor é calculado uma vez só."""
+
+    def __init__(self, scorer, rules):
+        super().__init__()
+        self.scorer = scorer
+        self.rules = rules
+
+    def __missing__(self, value):
+        s = self[value] = self.scorer(value, self.rules)
+        return s
+
+_score_tables = {}
+_last_tables = [None, None]   # [cópia das restrições, tabelas]: evita recongelar a cada boss
+SCORE_TABLE_CACHE = 64
+
+def _freeze(rules):
+    return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in rules.items()))
+
+def score_tables():
+    """Tabelas de consulta de cada atributo para as restrições atuais (reaproveitadas entre rankings)."""
+    if _last_tables[0] == constraints:
+        return _last_tables[1]
+    key = tuple(_freeze(constraints[attr]) for attr in WEIGHTS)
+    tables = _score_tables.get(key)
+    if tables is None:
+        if len(_score_tables) >= SCORE_TABLE_CACHE:
+            _score_tables.clear()
+        tables = _score_tables[key] = {
+            attr: ScoreTable(score_hp if attr == "HP" else score_count,
+                             {k: list(v) if isinstance(v, list) else v for k, v in constraints[attr].items()})
+            for attr in WEIGHTS
+        }
+    _last_tables[0] = {attr: tables[attr].rules for attr in WEIGHTS}
+    _last_tables[1] = tables
+    return tables
+
+def composite_score(boss, tables=None):
+    """Combina os scores de cada atributo com pesos (consultas às tabelas do estado atual)."""
+    tables = tables or score_tables()
+    parts = {attr: tables[attr][getattr(boss, FIELD_ATTRS[attr])] for attr in WEIGHTS}
+
+    total = sum(parts[k] * WEIGHTS[k] for k in parts)
     
-    if constraints["Immunity"].get("exact") == 0 and boss["imm_count"] == 0:
+    if constraints["Immunity"].get("exact") == 0 and boss.imm_count == 0:
         total *= 1.05
     
-    if constraints["Weapons"].get("exact") == 0 and boss["wep_count"] == 0:
+    if constraints["Weapons"].get("exact") == 0 and boss.wep_count == 0:
         total *= 1.05
     return total, parts
 
+@traced("v1.rank_bosses")
 def rank_bosses(bosses_list):
+    tables = score_tables()   # um estado por chamada: compila uma vez, consulta por boss
     scored = []
     for b in bosses_list:
-        s, parts = composite_score(b)
+        s, parts = composite_score(b, tables)
         scored.append((s, b, parts))
     scored.sort(key=lambda x: x[0], reverse=True)
     return scored
@@ -271,13 +340,20 @@ def rank_bosses(bosses_list):
 
 # LÓGICA DE PALPITES
 
+@traced("v1.pick_best_from_suggestions")
 def pick_best_from_suggestions(suggestions, tried_names):
     """Escolhe o melhor boss (maior score) entre as sugestões ainda não tentadas."""
-    pool = [b for b in bosses if b["name"] in suggestions and b["name"] not in tried_names]
+    ids, unresolved = names.resolve(suggestions)
+    if unresolved:
+        print(f"⚠️ Sugestões sem boss no dataset: {unresolved}")
+    suggested = [bosses[i] for i in ids.tolist()]
+    pool = [b for b in suggested if b.name not in tried_names and candidates.is_alive(b)]
     if not pool:
-        pool = [b for b in bosses if b["name"] in suggestions]
+        pool = [b for b in suggested if b.name not in tried_names]
+    if not pool:
+        pool = suggested
     ranked = rank_bosses(pool)
-    return ranked[0][1]["name"] if ranked else random.choice(suggestions)
+    return ranked[0][1].name if ranked else random.choice(suggestions)
 
 def print_feedback(feedback):
     print(" Feedback:")
@@ -300,80 +376,95 @@ def pretty_constraints(cdict):
 
 # LOOP PRINCIPAL
 
-letters = list("abcdefghijklmnopqrstuvwxyz")
-random.shuffle(letters)
-used_letters = set()
-tried_names = set()
+def main():
+    from selenium.webdriver.common.by import By
 
-for attempt in range(1, MAX_ATTEMPTS + 1):
-    available_letters = [l for l in letters if l not in used_letters]
-    if not available_letters:
-        break
-    letter = random.choice(available_letters)
-    used_letters.add(letter)
+    t0 = time.perf_counter()
+    start_driver()
+    print(f"⏱️ Navegador pronto em {time.perf_counter() - t0:.1f}s")
 
-    try:
-        input_box = driver.find_element(By.CSS_SELECTOR, "input")
-        input_box.clear()
-        input_box.send_keys(letter)
-    except:
-        pass
+    letters = list("abcdefghijklmnopqrstuvwxyz")
+    random.shuffle(letters)
+    used_letters = set()
+    tried_names = set()
 
-    suggestions = wait_for_suggestions(timeout=WAIT_SUGGESTIONS_SECS)
-    print(f"\n📌 Sugestões encontradas: {suggestions}")
-    print(f"🔎 Tentativa {attempt}/{MAX_ATTEMPTS}")
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        with trace_span("v1.attempt", attempt=attempt):
+            available_letters = [l for l in letters if l not in used_letters]
+            if not available_letters:
+                break
+            letter = random.choice(available_letters)
+            used_letters.add(letter)
 
-    if not suggestions:
-        continue
+            stale = get_suggestions()
+            try:
+                input_box = driver.find_element(By.CSS_SELECTOR, "input")
+                input_box.clear()
+                input_box.send_keys(letter)
+            except:
+                pass
 
-    chosen = pick_best_from_suggestions(suggestions, tried_names)
-    tried_names.add(chosen)
+            suggestions = wait_for_suggestions(timeout=WAIT_SUGGESTIONS_SECS, before=stale)
+            print(f"\n📌 Sugestões encontradas: {suggestions}")
+            print(f"🔎 Tentativa {attempt}/{MAX_ATTEMPTS}")
 
-    if not type_and_enter(chosen):
-        print("Input desativado. Provavelmente o jogo acabou.")
-        break
+            if not suggestions:
+                continue
 
-    print(f"\n🎯 Palpite enviado: {chosen}")
-    time.sleep(random.uniform(2.2, 3.6))
+            chosen = pick_best_from_suggestions(suggestions, tried_names)
+            tried_names.add(chosen)
 
-    feedback = get_feedback()
-    if not feedback:
-        continue
+            rows_before = mark_feedback_rows(driver)
+            if not type_and_enter(chosen):
+                print("Input desativado. Provavelmente o jogo acabou.")
+                break
 
-    print_feedback(feedback)
+            print(f"\n🎯 Palpite enviado: {chosen}")
+            if not wait_for_new_feedback_row(driver, rows_before, timeout=FEEDBACK_TIMEOUT_SECS):
+                print("Feedback não apareceu a tempo; lendo a tabela atual.")
 
-    # atualiza pistas
-    guessed_boss = next((b for b in bosses if b["name"] == chosen), None)
-    if guessed_boss:
-        update_constraints_from_feedback(guessed_boss, feedback)
+            feedback = get_feedback()
+            if not feedback:
+                continue
 
-    # terminou
-    if all(v == "✅" for v in feedback.values()):
-        print(f"\n🔥 Boss encontrado: {chosen}")
-        break
+            print_feedback(feedback)
 
-    # Log de restrições (para acompanhar raciocínio)
-    print(f"📚 Restrições acumuladas: {pretty_constraints(constraints)}")
+            # atualiza pistas
+            guessed_boss = names.boss(chosen)
+            if guessed_boss:
+                update_constraints_from_feedback(guessed_boss, feedback)
 
+            # terminou
+            if all(v == "✅" for v in feedback.values()):
+                print(f"\n🔥 Boss encontrado: {chosen}")
+                break
 
-# RANKING FINAL
+            # Log de restrições (para acompanhar raciocínio)
+            print(f"📚 Restrições acumuladas: {pretty_constraints(constraints)}")
+            print(f"🧮 Candidatos possíveis: {candidates.count()}/{candidates.n}")
 
-print("\n🏁 Fim do script. Calculando ranking final por probabilidade…")
 
-final_ranking = rank_bosses(bosses)
-top5 = final_ranking[:5]
+    # ranking final
+    print("\n🏁 Fim do script. Calculando ranking final por probabilidade…")
 
-if top5:
-    best = top5[0]
-    best_score, best_boss, parts = best
-    print(f"\n🏆 Melhor candidato provável: {best_boss['name']}  (score: {best_score:.2f})")
-    print("   Detalhe dos componentes do score:")
-    for k, v in parts.items():
-        print(f"   - {k}: {v:.3f}")
+    final_ranking = rank_bosses([b for b in bosses if candidates.is_alive(b)])
+    top5 = final_ranking[:5]
 
-    print("\n📊 Top 5 candidatos:")
-    for i, (score, b, p) in enumerate(top5, start=1):
-        print(f"  {i}. {b['name']} — score {score:.2f} | HP={b['hp']} | Wep={b['wep_count']} | Res={b['res_count']} | Weak={b['weak_count']} | Imm={b['imm_count']} | Opt={b['optional']}")
+    if top5:
+        best = top5[0]
+        best_score, best_boss, parts = best
+        print(f"\n🏆 Melhor candidato provável: {best_boss.name}  (score: {best_score:.2f})")
+        print("   Detalhe dos componentes do score:")
+        for k, v in parts.items():
+            print(f"   - {k}: {v:.3f}")
 
-else:
-    print("Nenhum boss para ranquear.")
+        print("\n📊 Top 5 candidatos:")
+        for i, (score, b, p) in enumerate(top5, start=1):
+            print(f"  {i}. {b.name} — score {score:.2f} | HP={b.hp} | Wep={b.wep_count} | Res={b.res_count} | Weak={b.weak_count} | Imm={b.imm_count} | Opt={b.optional}")
+
+    else:
+        print("Nenhum boss para ranquear.")
+
+
+if __name__ == "__main__":
+    main()